@@ -2,51 +2,104 @@ import json
 import re
 from datetime import datetime, timedelta
 import requests
+from config import UserPreferences
+from responses import ResponseTemplates
+from intent_ranking import IntentRanker
+
+# Intent patterns, compiled once into one alternation per intent; its
+# leftmost match is the earliest place any of the intent's patterns matches
+INTENT_PATTERNS = {
+    intent: re.compile("|".join(f"(?:{pattern})" for pattern in patterns), re.IGNORECASE)
+    for intent, patterns in {
+        "time_query": [r"what.*time", r"current time", r"time.*now"],
+        "date_query": [r"what.*date", r"today.*date", r"current date"],
+        "weather_query": [r"weather.*like", r"temperature.*today", r"forecast"],
+        "search_query": [r"search.*for", r"look.*up", r"find.*information"],
+        "email_intent": [r"send.*email", r"compose.*email", r"email.*to"],
+        "reminder_intent": [r"remind.*me", r"set.*reminder", r"don't.*forget"],
+        "smart_home": [r"turn.*on", r"turn.*off", r"dim.*lights", r"set.*temperature"]
+    }.items()
+}
+
+# Words every pattern of an intent contains; intents without one are skipped
+# before running their regexes
+INTENT_KEYWORDS = {
+    "time_query": ["time"],
+    "date_query": ["date"],
+    "weather_query": ["weather", "temperature", "forecast"],
+    "search_query": ["search", "look", "find"],
+    "email_intent": ["email"],
+    "reminder_intent": ["remind", "forget"],
+    "smart_home": ["turn", "dim", "temperature"]
+}
+
+# One scan finds the keywords present; each maps to the intents it unlocks
+KEYWORD_INTENTS = {}
+for intent, keywords in INTENT_KEYWORDS.items():
+    for keyword in keywords:
+        KEYWORD_INTENTS.setdefault(keyword, []).append(intent)
+KEYWORD_PATTERN = re.compile("|".join(map(re.escape, KEYWORD_INTENTS)))
+
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+TIME_EXPRESSION_PATTERN = re.compile(r'\b(?:in\s+)?(\d+)\s+(minute|hour|day)s?\b')
+NUMBER_PATTERN = re.compile(r'\b\d+\b')
 
 class AdvancedVoiceAssistant:
-    def __init__(self):
+    def __init__(self, intent_stats=None, user=None):
+        # Preferences come from the user profile (config.user) when given
+        user = user or UserPreferences()
         self.user_preferences = {
-            "name": "User",
-            "location": "New York",
+            "name": user.name,
+            "location": user.default_location,
             "email": "",
-            "smart_home_devices": []
+            "smart_home_devices": [],
+            "language": user.language,
+            "time_format": user.time_format
         }
+        self.responses = ResponseTemplates(self.user_preferences["language"],
+                                           self.user_preferences["time_format"])
         self.conversation_history = []
         self.custom_commands = {}
+        # Usage counters persisted with the user profile (config.intent_stats)
+        self.intent_ranker = IntentRanker(INTENT_PATTERNS, intent_stats)
     
     def natural_language_processing(self, text):
         """Basic NLP for intent recognition"""
-        # Intent patterns
-        intents = {
-            "time_query": [r"what.*time", r"current time", r"time.*now"],
-            "date_query": [r"what.*date", r"today.*date", r"current date"],
-            "weather_query": [r"weather.*like", r"temperature.*today", r"forecast"],
-            "search_query": [r"search.*for", r"look.*up", r"find.*information"],
-            "email_intent": [r"send.*email", r"compose.*email", r"email.*to"],
-            "reminder_intent": [r"remind.*me", r"set.*reminder", r"don't.*forget"],
-            "smart_home": [r"turn.*on", r"turn.*off", r"dim.*lights", r"set.*temperature"]
-        }
-        
         # Extract entities
         entities = {
-            "time_expressions": re.findall(r'\b(?:in\s+)?(\d+)\s+(minute|hour|day)s?\b', text),
-            "email_addresses": re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text),
-            "numbers": re.findall(r'\b\d+\b', text),
+            "time_expressions": TIME_EXPRESSION_PATTERN.findall(text),
+            "email_addresses": EMAIL_PATTERN.findall(text),
+            "numbers": NUMBER_PATTERN.findall(text),
             "locations": self.extract_locations(text)
         }
         
-        # Determine intent
-        detected_intent = "unknown"
-        for intent, patterns in intents.items():
-            for pattern in patterns:
-                if re.search(pattern, text, re.IGNORECASE):
-                    detected_intent = intent
-                    break
-            if detected_intent != "unknown":
-                break
+        # Determine intent from every intent whose patterns match. The phrase
+        # that starts first carries the request ("remind me to turn off the
+        # oven"); the user's most frequent intent wins ties.
+        candidates = {intent for keyword in KEYWORD_PATTERN.findall(text.lower())
+                      for intent in KEYWORD_INTENTS[keyword]}
+        matches = []
+        for intent in self.intent_ranker.order:
+            if intent in candidates:
+                match = INTENT_PATTERNS[intent].search(text)
+                if match:
+                    matches.append((match.start(), intent))
+        # sort() is stable, so equal starts keep the ranker's order
+        matches.sort(key=lambda match: match[0])
+        matched = [intent for _, intent in matches]
+        
+        if matched:
+            detected_intent = matched[0]
+            confidence = self.intent_ranker.confidence(detected_intent, matched[1:])
+            self.intent_ranker.record(detected_intent)
+        else:
+            detected_intent = "unknown"
+            confidence = 0.0
         
         return {
             "intent": detected_intent,
+            "confidence": confidence,
+            "alternatives": matched[1:],
             "entities": entities,
             "original_text": text
         }
@@ -105,24 +158,15 @@ class AdvancedVoiceAssistant:
         """Generate personalized responses based on user preferences and history"""
         user_name = self.user_preferences.get("name", "User")
         
-        # Time-based greetings
-        current_hour = datetime.now().hour
-        if current_hour < 12:
-            greeting = "Good morning"
-        elif current_hour < 17:
-            greeting = "Good afternoon"
-        else:
-            greeting = "Good evening"
-        
-        # Personalized responses based on intent
+        # Personalized responses based on intent; time-based greetings come from the template
         if intent == "time_query":
-            return f"{greeting} {user_name}! " + self.get_current_time()
+            return self.responses.render("time_personal", name=user_name)
         
         elif intent == "weather_query":
-            location = entities.get("locations", [self.user_preferences["location"]])[0]
-            return f"Let me check the weather in {location} for you, {user_name}."
+            location = (entities.get("locations") or [self.user_preferences["location"]])[0]
+            return self.responses.render("weather_lookup", name=user_name, location=location)
         
-        return f"How can I help you today, {user_name}?"
+        return self.responses.render("offer_help", name=user_name)
     
     def add_custom_command(self, trigger_phrase, response):
         """Allow users to add custom commands"""
@@ -169,8 +213,7 @@ class AdvancedVoiceAssistant:
         filtered_text = text
         
         # Remove email addresses from logs
-        filtered_text = re.sub(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', 
-                              '[EMAIL_REDACTED]', filtered_text)
+        filtered_text = EMAIL_PATTERN.sub('[EMAIL_REDACTED]', filtered_text)
         
         # Remove phone numbers
         filtered_text = re.sub(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b', 
@@ -184,14 +227,12 @@ class AdvancedVoiceAssistant:
     
     def get_current_time(self):
         """Get current time with enhanced formatting"""
-        now = datetime.now()
-        time_string = now.strftime("%I:%M %p")
-        date_string = now.strftime("%A, %B %d")
-        return f"It's {time_string} on {date_string}"
+        return self.responses.render("time_long")
 
 def main():
     """Demonstrate advanced features"""
-    assistant = AdvancedVoiceAssistant()
+    from config import config
+    assistant = AdvancedVoiceAssistant(config.intent_stats, config.user)
     
     print("Advanced Voice Assistant Features Demo")
     print("=" * 40)
@@ -207,7 +248,7 @@ def main():
     for command in test_commands:
         print(f"\nInput: {command}")
         nlp_result = assistant.natural_language_processing(command)
-        print(f"Intent: {nlp_result['intent']}")
+        print(f"Intent: {nlp_result['intent']} (confidence {nlp_result['confidence']})")
         print(f"Entities: {nlp_result['entities']}")
     
     # Test custom commands
@@ -216,6 +257,9 @@ def main():
     
     # Test smart home
     print(f"\nSmart home test: {assistant.smart_home_control('turn on the lights')}")
+    
+    # Keep the learned intent order for the next session
+    config.save_user_config()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,169 @@
+"""
+Audio capture to disk and memory-mapped replay for the Voice Assistant.
+
+A capture directory holds one raw PCM file per utterance plus a
+manifest.jsonl with one metadata line per segment, so recording only ever
+appends. ReplayMicrophone memory-maps those segments and serves them to
+speech_recognition as if they came from a microphone.
+"""
+
+import json
+import mmap
+import os
+import time
+
+import speech_recognition as sr
+
+MANIFEST_NAME = "manifest.jsonl"
+
+class AudioRecorder:
+    """Write captured AudioData to a segmented capture directory"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.manifest_path = os.path.join(directory, MANIFEST_NAME)
+        self.segment_count = len(load_manifest(directory))
+
+    def record(self, audio, energy_threshold=None, transcript=None):
+        """Append one utterance and return its segment file name"""
+        filename = f"segment_{self.segment_count:05d}.pcm"
+        with open(os.path.join(self.directory, filename), 'wb') as f:
+            f.write(audio.frame_data)
+
+        entry = {
+            'file': filename,
+            'sample_rate': audio.sample_rate,
+            'sample_width': audio.sample_width,
+            'bytes': len(audio.frame_data),
+            'energy_threshold': energy_threshold,
+            'transcript': transcript,
+            'captured_at': time.time()
+        }
+        with open(self.manifest_path, 'a') as f:
+            f.write(json.dumps(entry) + "\n")
+
+        self.segment_count += 1
+        return filename
+
+def load_manifest(directory):
+    """Read the segment metadata of a capture directory"""
+    manifest_path = os.path.join(directory, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return []
+
+    with open(manifest_path, 'r') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+class MappedStream:
+    """File-like reader over a memory-mapped segment that hands out views, not copies"""
+
+    def __init__(self, path, frame_width):
+        self.frame_width = frame_width
+        self.file = open(path, 'rb')
+        size = os.fstat(self.file.fileno()).st_size
+        # mmap cannot map an empty file
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        self.view = memoryview(self.map) if self.map else memoryview(b"")
+        self.position = 0
+
+    def read(self, size):
+        chunk = self.view[self.position:self.position + size * self.frame_width]
+        self.position += len(chunk)
+        return chunk
+
+    def close(self):
+        self.view.release()
+        if self.map is not None:
+            try:
+                self.map.close()
+            except BufferError:
+                # A caller still holds a chunk; the map is freed with it
+                pass
+        self.file.close()
+
+class ReplayMicrophone(sr.AudioSource):
+    """Fake microphone that plays back a capture directory one utterance per `with` block"""
+
+    CHUNK = 1024
+
+    def __init__(self, directory, loop=False):
+        self.directory = directory
+        self.segments = load_manifest(directory)
+        if not self.segments:
+            raise ValueError(f"No captured audio found in {directory}")
+
+        self.loop = loop
+        self.index = 0
+        self.stream = None
+        self.SAMPLE_RATE = self.segments[0]['sample_rate']
+        self.SAMPLE_WIDTH = self.segments[0]['sample_width']
+        self.energy_threshold = self.segments[0]['energy_threshold']
+
+    @property
+    def exhausted(self):
+        return not self.loop and self.index >= len(self.segments)
+
+    def __enter__(self):
+        if self.exhausted:
+            raise EOFError(f"All {len(self.segments)} captured segments have been replayed")
+
+        segment = self.segments[self.index % len(self.segments)]
+        self.index += 1
+        self.SAMPLE_RATE = segment['sample_rate']
+        self.SAMPLE_WIDTH = segment['sample_width']
+        self.energy_threshold = segment['energy_threshold']
+
+        # speech_recognition reads CHUNK frames at a time, not bytes
+        self.stream = MappedStream(os.path.join(self.directory, segment['file']), self.SAMPLE_WIDTH)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stream.close()
+        self.stream = None
+
+def main():
+    """Replay a capture directory through the Recognizer and report latency"""
+    import argparse
+    import statistics
+
+    parser = argparse.ArgumentParser(description="Replay captured audio through speech recognition")
+    parser.add_argument("directory", help="capture directory written by AudioRecorder")
+    parser.add_argument("--recognizer", choices=["none", "google", "sphinx"], default="none",
+                        help="also time recognition with this backend")
+    args = parser.parse_args()
+
+    recognizer = sr.Recognizer()
+    microphone = ReplayMicrophone(args.directory)
+    capture_times, recognition_times = [], []
+    compared, matched = 0, 0
+
+    while not microphone.exhausted:
+        started = time.perf_counter()
+        with microphone as source:
+            recognizer.energy_threshold = source.energy_threshold or recognizer.energy_threshold
+            audio = recognizer.listen(source)
+        capture_times.append((time.perf_counter() - started) * 1000)
+
+        if args.recognizer != "none":
+            expected = microphone.segments[microphone.index - 1].get('transcript')
+            started = time.perf_counter()
+            try:
+                result = getattr(recognizer, f"recognize_{args.recognizer}")(audio).lower()
+            except (sr.UnknownValueError, sr.RequestError) as e:
+                print(f"Segment {microphone.index - 1}: {e!r}")
+                result = None
+            recognition_times.append((time.perf_counter() - started) * 1000)
+            if expected is not None:
+                compared += 1
+                matched += result == expected
+
+    print(f"Replayed {len(capture_times)} segments from {args.directory}")
+    print(f"Capture:     mean {statistics.mean(capture_times):.2f} ms, max {max(capture_times):.2f} ms")
+    if recognition_times:
+        print(f"Recognition: mean {statistics.mean(recognition_times):.2f} ms, max {max(recognition_times):.2f} ms")
+    if compared:
+        print(f"Transcripts: {matched}/{compared} match the ones recorded at capture time")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Evaluate intent routing latency and accuracy on a replayed transcript corpus,
+with static pattern order versus per-user adaptive ranking.
+"""
+
+import random
+import time
+
+from advanced_features import AdvancedVoiceAssistant
+
+# Transcripts labelled with what the phrase means, independent of how often
+# this user issues that intent. The last phrase of several lists also matches
+# another intent's patterns; picking by usage alone misroutes those that
+# belong to a rarer intent.
+TRANSCRIPTS = {
+    "smart_home": [
+        "turn on the kitchen lights", "turn off the bedroom light", "dim the lights please",
+        "turn the heating on", "set the temperature to 21 for today"
+    ],
+    "reminder_intent": [
+        "remind me to water the plants in 10 minutes", "set a reminder for the meeting",
+        "don't let me forget the laundry", "remind me to turn off the oven in 20 minutes"
+    ],
+    "time_query": ["what time is it", "what's the current time", "time right now"],
+    "weather_query": [
+        "what's the weather like", "what's the forecast for tomorrow",
+        "is the weather like this all week, should i turn on the heating"
+    ],
+    "email_intent": ["send an email to alice", "compose an email to the team"],
+    "search_query": ["search for pasta recipes", "find information on heat pumps",
+                     "look up what time the pharmacy closes"],
+    "date_query": ["what's the date", "current date please"]
+}
+
+# How often this user issues each intent
+USER_MIX = {
+    "smart_home": 45, "reminder_intent": 25, "time_query": 12, "weather_query": 8,
+    "email_intent": 4, "search_query": 3, "date_query": 3
+}
+
+def build_corpus(size, seed=0):
+    rng = random.Random(seed)
+    intents = list(USER_MIX)
+    weights = [USER_MIX[intent] for intent in intents]
+    corpus = []
+    for _ in range(size):
+        intent = rng.choices(intents, weights)[0]
+        corpus.append((rng.choice(TRANSCRIPTS[intent]), intent))
+    return corpus
+
+def evaluate(assistant, corpus):
+    """Return (accuracy, microseconds per command, {intent: (misrouted, total)}, ambiguous share)"""
+    results = []
+    started = time.perf_counter()
+    for text, _ in corpus:
+        results.append(assistant.natural_language_processing(text))
+    elapsed = time.perf_counter() - started
+
+    misroutes = {intent: [0, 0] for intent in USER_MIX}
+    for (_, expected), result in zip(corpus, results):
+        misroutes[expected][1] += 1
+        if result["intent"] != expected:
+            misroutes[expected][0] += 1
+    wrong = sum(misrouted for misrouted, _ in misroutes.values())
+    ambiguous = sum(1 for result in results if result["alternatives"])
+    return 1 - wrong / len(corpus), elapsed / len(corpus) * 1e6, misroutes, ambiguous / len(corpus)
+
+def main():
+    """Replay the corpus through static and adaptive routing"""
+    corpus = build_corpus(20000)
+
+    static = AdvancedVoiceAssistant()
+    static.intent_ranker.adaptive = False
+    adaptive = AdvancedVoiceAssistant(intent_stats={})
+
+    print(f"Intent routing on {len(corpus)} replayed transcripts")
+    print("=" * 50)
+    breakdown = {}
+    for label, assistant in [("static order", static), ("adaptive", adaptive)]:
+        accuracy, latency, breakdown[label], ambiguous = evaluate(assistant, corpus)
+        print(f"{label:>13}: accuracy {accuracy:6.1%}  latency {latency:6.1f} us/command  "
+              f"flagged ambiguous {ambiguous:5.1%}")
+
+    print("\nMisrouted by intent, most frequent first (static / adaptive)")
+    for intent in USER_MIX:
+        rates = []
+        for label in breakdown:
+            misrouted, total = breakdown[label][intent]
+            rates.append(f"{misrouted / total:6.1%}")
+        print(f"{intent:>16}: {' / '.join(rates)}")
+    print(f"\nLearned order: {', '.join(adaptive.intent_ranker.order)}")
+
+if __name__ == "__main__":
+    main()
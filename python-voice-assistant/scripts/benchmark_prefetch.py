@@ -0,0 +1,67 @@
+"""
+Benchmark time-to-first-audio with and without speculative weather prefetch.
+
+Replays a session through a headless VoiceAssistant whose weather API points
+at a local stub server, so the numbers do not depend on the network or an
+OpenWeatherMap key.
+"""
+
+import statistics
+import time
+
+from stub_weather import start_stub_weather
+from voice_assistant import VoiceAssistant
+
+WEATHER_DELAY = 0.3       # simulated upstream latency in seconds
+RECOGNITION_DELAY = 0.5   # simulated speech recognition round trip
+
+SESSION = [
+    "hello",
+    "what's the weather in paris",
+    "what about the weather in paris tomorrow",
+    "what time is it",
+    "good morning",
+    "weather please",
+    "search for python tutorials",
+    "what's the weather in london",
+    "and the weather in london",
+]
+
+def replay(assistant, session):
+    """Return time-to-first-audio for each turn of a session, in milliseconds"""
+    latencies = []
+    for command in session:
+        time.sleep(RECOGNITION_DELAY)   # user speaking + recognition
+
+        first_audio = []
+        started = time.perf_counter()
+        assistant.respond(command, lambda text: first_audio.append(time.perf_counter()) if not first_audio else None)
+        latencies.append((first_audio[0] - started) * 1000)
+
+        # As run() does after each command
+        assistant.end_turn(command)
+    return latencies
+
+def main():
+    """Run the session with prefetch disabled and enabled"""
+    server, url = start_stub_weather(WEATHER_DELAY)
+
+    print("Time-to-first-audio on replayed session (ms)")
+    print("=" * 50)
+    for enabled in (False, True):
+        assistant = VoiceAssistant(headless=True)
+        assistant.weather_api_url = url
+        assistant.weather_api_key = "stub-key"
+        if not enabled:
+            # With no fetchers registered, anticipate() schedules nothing
+            assistant.prefetcher.fetchers.clear()
+        latencies = replay(assistant, SESSION)
+        label = "prefetch" if enabled else "baseline"
+        print(f"{label:>9}: mean {statistics.mean(latencies):7.1f}  "
+              f"max {max(latencies):7.1f}  stats {assistant.prefetcher.stats}")
+        assistant.prefetcher.shutdown()
+
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,9 @@ class VoiceConfig:
     tts_rate: int = 150
     tts_volume: float = 0.9
     wake_word: str = "hello assistant"
+    # Record captured utterances here, or replay them instead of using the microphone
+    capture_directory: str = os.getenv('ASSISTANT_CAPTURE_DIR', '')
+    replay_directory: str = os.getenv('ASSISTANT_REPLAY_DIR', '')
 
 @dataclass
 class APIConfig:
@@ -36,6 +39,16 @@ class UserPreferences:
     time_format: str = "12"  # 12 or 24 hour
     language: str = "en-US"
 
+@dataclass
+class SearchConfig:
+    """Local search index configuration"""
+    # Directory of .txt/.md files or a .jsonl file of {"title", "text"} documents
+    corpus_path: str = os.getenv('ASSISTANT_SEARCH_CORPUS', '')
+    min_score: float = 0.5
+    # Share of the query's terms the best document must contain
+    min_coverage: float = 0.5
+    cache_size: int = 1024
+
 class AssistantConfig:
     """Main configuration class"""
     
@@ -43,6 +56,9 @@ class AssistantConfig:
         self.voice = VoiceConfig()
         self.api = APIConfig()
         self.user = UserPreferences()
+        self.search = SearchConfig()
+        # Per-user intent usage counters, see intent_ranking.IntentRanker
+        self.intent_stats = {}
         
         # Load custom settings if available
         self.load_user_config()
@@ -68,6 +84,10 @@ class AssistantConfig:
                     for key, value in config_data['voice'].items():
                         if hasattr(self.voice, key):
                             setattr(self.voice, key, value)
+                
+                # Updated in place so rankers already holding the dict see it
+                if 'intent_stats' in config_data:
+                    self.intent_stats.update(config_data['intent_stats'])
                             
         except Exception as e:
             print(f"Could not load user config: {e}")
@@ -91,7 +111,8 @@ class AssistantConfig:
                     'tts_rate': self.voice.tts_rate,
                     'tts_volume': self.voice.tts_volume,
                     'wake_word': self.voice.wake_word
-                }
+                },
+                'intent_stats': self.intent_stats
             }
             
             with open("user_config.json", 'w') as f:
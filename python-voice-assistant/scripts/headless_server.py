@@ -0,0 +1,307 @@
+"""
+Headless HTTP/WebSocket interface for the Voice Assistant.
+
+Endpoints:
+  POST /command   JSON {"text": ...} or {"audio": <base64 WAV>}, optional
+                  "synthesize": true. Also accepts a raw audio/wav body.
+                  Streams newline-delimited JSON, one line per response.
+  GET  /health    Circuit breaker state of the external services.
+  GET  /ws        WebSocket; each text message is a command, answered with
+                  one JSON message per response and a final {"done": true}.
+
+Connections are HTTP/1.1 keep-alive, so clients may pipeline requests.
+"""
+
+import base64
+import binascii
+import hashlib
+import json
+import struct
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+# Commands are short; larger messages are rejected before they are read
+MAX_MESSAGE_SIZE = 64 * 1024
+
+class FrameError(Exception):
+    """A WebSocket protocol violation, closed with the given status code"""
+
+    def __init__(self, status, reason):
+        super().__init__(reason)
+        self.status = status
+        self.reason = reason
+
+class AssistantServer(ThreadingHTTPServer):
+    """Thread-per-connection server sharing one headless VoiceAssistant"""
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, address, assistant):
+        super().__init__(address, AssistantRequestHandler)
+        self.assistant = assistant
+
+class AssistantRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "VoiceAssistant/1.0"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path == "/health":
+            self.send_json(200, self.server.assistant.resilience.health())
+        elif self.path == "/ws" and self.headers.get("Upgrade", "").lower() == "websocket":
+            self.handle_websocket()
+        else:
+            self.send_json(404, {"error": f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/command":
+            self.drain_body()
+            self.send_json(404, {"error": f"Unknown path {self.path}"})
+            return
+
+        try:
+            request = self.read_command_request()
+            command = self.command_from_request(request)
+        except (ValueError, binascii.Error) as e:
+            self.send_json(400, {"error": str(e)})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        synthesize = bool(request.get("synthesize"))
+        self.write_chunk({"transcript": command})
+        try:
+            should_continue = self.server.assistant.respond(
+                command, lambda text: self.write_chunk(self.response_message(text, synthesize))
+            )
+        except Exception as e:
+            # Headers are already sent, so report the failure in the stream
+            self.write_chunk({"error": f"Error processing command: {e}"})
+            should_continue = True
+        self.write_chunk({"done": True, "continue": should_continue})
+        self.wfile.write(b"0\r\n\r\n")
+
+    def drain_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def read_command_request(self):
+        body = self.drain_body()
+        content_type = self.headers.get("Content-Type", "").split(";")[0].strip()
+        if content_type.startswith("audio/"):
+            return {"audio_bytes": body}
+        try:
+            request = json.loads(body or b"{}")
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON: {e}")
+        if not isinstance(request, dict):
+            raise ValueError("Request body must be a JSON object")
+        return request
+
+    def command_from_request(self, request):
+        """Turn a text or audio request into a lower-case command"""
+        if "text" in request:
+            return str(request["text"]).strip().lower()
+        if "audio" in request:
+            return self.transcribe(base64.b64decode(request["audio"], validate=True))
+        if "audio_bytes" in request:
+            return self.transcribe(request["audio_bytes"])
+        raise ValueError("Request needs 'text' or 'audio'")
+
+    def transcribe(self, data):
+        import speech_recognition as sr
+        try:
+            return self.server.assistant.transcribe_wav(data)
+        except sr.UnknownValueError:
+            return ""
+        except sr.RequestError as e:
+            raise ValueError(f"Could not transcribe audio: {e}")
+
+    def response_message(self, text, synthesize):
+        message = {"text": text}
+        if synthesize:
+            message["audio"] = base64.b64encode(self.server.assistant.synthesize(text)).decode("ascii")
+        return message
+
+    def write_chunk(self, message):
+        data = json.dumps(message).encode() + b"\n"
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def send_json(self, status, message):
+        body = json.dumps(message).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    # WebSocket (RFC 6455) -- text frames only, enough for a command channel
+
+    def handle_websocket(self):
+        key = self.headers.get("Sec-WebSocket-Key", "")
+        accept = base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode()).digest()).decode()
+        self.send_response(101)
+        self.send_header("Upgrade", "websocket")
+        self.send_header("Connection", "Upgrade")
+        self.send_header("Sec-WebSocket-Accept", accept)
+        self.end_headers()
+        self.wfile.flush()
+
+        send = lambda message: self.send_frame(0x1, json.dumps(message).encode())
+        while True:
+            try:
+                message = self.read_message()
+            except FrameError as e:
+                self.send_frame(0x8, struct.pack("!H", e.status) + e.reason.encode())
+                break
+            if message is None:
+                break
+            opcode, payload = message
+            if opcode == 0x8:
+                self.send_frame(0x8, payload[:2])
+                break
+            if opcode != 0x1:
+                continue
+
+            command = payload.decode("utf-8", errors="replace").strip().lower()
+            try:
+                should_continue = self.server.assistant.respond(command, lambda text: send({"text": text}))
+            except Exception as e:
+                send({"error": f"Error processing command: {e}"})
+                should_continue = True
+            send({"done": True, "continue": should_continue})
+
+        self.close_connection = True
+
+    def read_exact(self, size):
+        data = self.rfile.read(size)
+        if len(data) < size:
+            raise FrameError(1002, "Truncated frame")
+        return data
+
+    def read_message(self):
+        """
+        Return the next (opcode, payload) data or close message, reassembled
+        from its fragments and answering pings on the way; None if the client
+        went away.
+        """
+        message_opcode, fragments, size = None, [], 0
+        while True:
+            frame = self.read_frame(MAX_MESSAGE_SIZE - size)
+            if frame is None:
+                return None
+            fin, opcode, payload = frame
+
+            # Control frames may arrive between the fragments of a message
+            if opcode >= 0x8:
+                if not fin or len(payload) > 125:
+                    raise FrameError(1002, "Control frames must not be fragmented")
+                if opcode == 0x8:
+                    return opcode, payload
+                if opcode == 0x9:
+                    self.send_frame(0xA, payload)
+                continue
+
+            if opcode == 0x0:
+                if message_opcode is None:
+                    raise FrameError(1002, "Continuation frame without a message")
+            elif message_opcode is not None:
+                raise FrameError(1002, "New message before the previous one finished")
+            else:
+                message_opcode = opcode
+            fragments.append(payload)
+            size += len(payload)
+            if fin:
+                return message_opcode, b"".join(fragments)
+
+    def read_frame(self, limit):
+        """Return (fin, opcode, payload), or None if the client went away"""
+        header = self.rfile.read(2)
+        if len(header) < 2:
+            return None
+        fin = bool(header[0] & 0x80)
+        opcode = header[0] & 0x0F
+        if not header[1] & 0x80:
+            raise FrameError(1002, "Client frames must be masked")
+
+        length = header[1] & 0x7F
+        if length == 126:
+            length = struct.unpack("!H", self.read_exact(2))[0]
+        elif length == 127:
+            length = struct.unpack("!Q", self.read_exact(8))[0]
+        # Control frames are at most 125 bytes and do not count towards the message
+        if opcode < 0x8 and length > limit:
+            raise FrameError(1009, f"Messages are limited to {MAX_MESSAGE_SIZE} bytes")
+
+        mask = self.read_exact(4)
+        payload = self.read_exact(length)
+        return fin, opcode, bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+
+    def send_frame(self, opcode, payload):
+        length = len(payload)
+        if length < 126:
+            header = struct.pack("!BB", 0x80 | opcode, length)
+        elif length < 65536:
+            header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+        else:
+            header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+        self.wfile.write(header + payload)
+        self.wfile.flush()
+
+def main():
+    """Run the assistant as a headless server"""
+    import argparse
+    from config import config
+    from preflight import missing_packages, run_preflight
+    from responses import ResponseTemplates
+
+    parser = argparse.ArgumentParser(description="Run the Voice Assistant without audio devices")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--weather-url", help="weather API endpoint, e.g. a stub_weather server for load tests")
+    parser.add_argument("--speech-stub", metavar="TRANSCRIPT",
+                        help="answer every transcription with this text instead of calling Google, for load tests")
+    parser.add_argument("--speech-delay", type=float, default=0.3, help="stub transcription latency in seconds")
+    args = parser.parse_args()
+
+    # Check dependencies before importing the assistant, as run_assistant does
+    missing = missing_packages(run_preflight())
+    if missing:
+        parser.exit(1, f"Missing required packages: {', '.join(missing)}\n"
+                       "Please install them using: python setup_requirements.py\n")
+    from voice_assistant import VoiceAssistant
+
+    assistant = VoiceAssistant(headless=True)
+    assistant.user_name = config.user.name
+    assistant.default_location = config.user.default_location
+    assistant.responses = ResponseTemplates(config.user.language, config.user.time_format)
+    if args.weather_url:
+        assistant.weather_api_url = args.weather_url
+    if args.speech_stub:
+        from stub_speech import StubRecognizer
+        assistant.recognize_online = StubRecognizer(args.speech_stub.lower(), args.speech_delay)
+    if config.search.corpus_path:
+        from search_index import SearchIndex
+        assistant.search_index = SearchIndex.from_path(
+            config.search.corpus_path, min_score=config.search.min_score,
+            min_coverage=config.search.min_coverage, cache_size=config.search.cache_size
+        )
+
+    server = AssistantServer((args.host, args.port), assistant)
+    print(f"Headless assistant listening on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down...")
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Per-user intent ranking from interaction statistics
+"""
+
+class IntentRanker:
+    """
+    Rank matching intents by how often, and how recently, the user issues them.
+
+    Statistics are kept as {"turn": n, "intents": {intent: [score, last_turn]}}
+    where score is a use count that halves every `half_life` turns. The dict is
+    plain JSON so it can be stored with the user profile.
+    """
+
+    def __init__(self, intents, stats=None, half_life=50, adaptive=True):
+        self.intents = list(intents)
+        self.stats = stats if stats is not None else {}
+        self.stats.setdefault("turn", 0)
+        self.stats.setdefault("intents", {})
+        self.decay = 0.5 ** (1 / half_life)
+        self.adaptive = adaptive
+        self.rebase()
+        self.order = self.rank()
+        # Decayed sum of all scores, maintained incrementally by record()
+        self.total = sum(self.score(intent) for intent in self.intents)
+
+    def rebase(self):
+        """
+        Decay every score to the current turn. In between, scores are kept as
+        weights relative to this base turn, so the decay of all of them is one
+        shared scale factor instead of a pow() per lookup.
+        """
+        turn = self.stats["turn"]
+        self.base_turn = turn
+        self.scale = 1.0
+        self.weights = {
+            intent: score * self.decay ** (turn - last_turn)
+            for intent, (score, last_turn) in self.stats["intents"].items()
+        }
+
+    def score(self, intent):
+        return self.weights.get(intent, 0.0) * self.scale
+
+    def rank(self):
+        """Intents by decayed score; ties keep the default order"""
+        if not self.adaptive:
+            return list(self.intents)
+        return sorted(self.intents, key=lambda intent: -self.score(intent))
+
+    def prior(self, intent):
+        """Smoothed share of the user's recent commands that had this intent"""
+        return (self.score(intent) + 1) / (self.total + len(self.intents))
+
+    def confidence(self, intent, rivals=()):
+        """
+        A pattern match is worth 0.5 and the user's history supplies the rest.
+        Other intents that also matched (rivals) take their share of it.
+        """
+        if not self.adaptive:
+            return 0.5
+        prior = self.prior(intent)
+        if rivals:
+            share = prior / (prior + sum(self.prior(rival) for rival in rivals))
+            return round((0.5 + 0.5 * prior) * share, 3)
+        return round(0.5 + 0.5 * prior, 3)
+
+    def record(self, intent):
+        """Count one use of an intent and move it up the ranking if it overtook others"""
+        if not self.adaptive:
+            return
+        turn = self.stats["turn"] = self.stats["turn"] + 1
+        self.scale *= self.decay
+        score = round(self.score(intent) + 1, 3)
+        self.stats["intents"][intent] = [score, turn]
+        weight = self.weights[intent] = score / self.scale
+        self.total = self.total * self.decay + 1
+
+        # Every other score decays by the same factor, so their relative order
+        # is unchanged and only the recorded intent can move
+        position = self.order.index(intent)
+        weights = self.weights
+        while position > 0 and weights.get(self.order[position - 1], 0.0) < weight:
+            self.order[position - 1], self.order[position] = self.order[position], self.order[position - 1]
+            position -= 1
+
+        if turn - self.base_turn >= 1000:
+            # Keep the weights well inside float range
+            self.rebase()
@@ -0,0 +1,162 @@
+"""
+Load generator for the headless assistant server.
+
+Each client holds one keep-alive connection and sends requests in
+pipelined batches, then reads the chunked responses back in order.
+
+The mix covers local commands as well as the external-I/O paths: weather
+lookups, audio transcription and synthesized replies. To keep load off the
+public weather and speech APIs, run the server against local stubs:
+
+    python load_generator.py --weather-stub-port 8766 ...
+    WEATHER_API_KEY=stub python headless_server.py \\
+        --weather-url http://127.0.0.1:8766/data/2.5/weather \\
+        --speech-stub "what time is it"
+"""
+
+import argparse
+import base64
+import io
+import json
+import socket
+import statistics
+import threading
+import time
+import wave
+
+def silent_wav(seconds=0.5, sample_rate=16000):
+    """A short silent 16-bit mono WAV, enough to exercise the transcription path"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(b"\x00\x00" * int(seconds * sample_rate))
+    return buffer.getvalue()
+
+# (type, request body); types are reported separately
+REQUEST_MIX = [
+    ("local", {"text": "what time is it"}),
+    ("local", {"text": "what's the date today"}),
+    ("local", {"text": "hello"}),
+    ("local", {"text": "status"}),
+    ("weather", {"text": "what's the weather in paris"}),
+    ("weather", {"text": "what's the weather in london"}),
+    ("search", {"text": "search for vpn setup"}),
+    ("audio", {"audio": base64.b64encode(silent_wav()).decode("ascii")}),
+    ("synthesize", {"text": "what time is it", "synthesize": True}),
+]
+
+def build_request(host, body):
+    body = json.dumps(body).encode()
+    return (
+        f"POST /command HTTP/1.1\r\nHost: {host}\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+    ).encode() + body
+
+def read_response(reader):
+    """Read one chunked or fixed-length response; returns (status, body)"""
+    status_line = reader.readline()
+    if not status_line:
+        raise ConnectionError("Server closed the connection")
+    status = int(status_line.split()[1])
+
+    headers = {}
+    while True:
+        line = reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if headers.get("transfer-encoding") == "chunked":
+        chunks = []
+        while True:
+            size = int(reader.readline().split(b";")[0], 16)
+            chunks.append(reader.read(size + 2)[:size])
+            if size == 0:
+                break
+        body = b"".join(chunks)
+    else:
+        body = reader.read(int(headers.get("content-length", 0)))
+    return status, body
+
+def run_client(host, port, requests_per_client, pipeline, offset, results):
+    try:
+        sock = socket.create_connection((host, port), timeout=60)
+    except OSError:
+        results.append(("connect", None, False))
+        return
+
+    reader = sock.makefile("rb")
+    sent = 0
+    try:
+        while sent < requests_per_client:
+            batch = [REQUEST_MIX[(offset + sent + i) % len(REQUEST_MIX)]
+                     for i in range(min(pipeline, requests_per_client - sent))]
+            started = time.perf_counter()
+            sock.sendall(b"".join(build_request(host, body) for _, body in batch))
+            for kind, _ in batch:
+                status, body = read_response(reader)
+                # Streamed responses report failures after the 200 status line
+                ok = status == 200 and b'"error"' not in body
+                results.append((kind, (time.perf_counter() - started) * 1000, ok))
+            sent += len(batch)
+    except (OSError, ValueError) as e:
+        results.append(("connection", None, False))
+        print(f"Client error: {e!r}")
+    finally:
+        reader.close()
+        sock.close()
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+def main():
+    """Drive the headless server with many concurrent keep-alive clients"""
+    parser = argparse.ArgumentParser(description="Load test the headless assistant server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=50, help="requests per client")
+    parser.add_argument("--pipeline", type=int, default=4, help="requests sent before reading responses")
+    parser.add_argument("--weather-stub-port", type=int, help="also serve a stub weather API on this port")
+    parser.add_argument("--weather-delay", type=float, default=0.2, help="stub weather latency in seconds")
+    args = parser.parse_args()
+
+    if args.weather_stub_port:
+        from stub_weather import start_stub_weather
+        _, url = start_stub_weather(args.weather_delay, port=args.weather_stub_port)
+        print(f"Stub weather API at {url}")
+
+    results = []
+    threads = [
+        threading.Thread(target=run_client,
+                         args=(args.host, args.port, args.requests, args.pipeline, i, results))
+        for i in range(args.clients)
+    ]
+
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    completed = [result for result in results if result[1] is not None]
+    print(f"{args.clients} clients x {args.requests} requests, pipeline depth {args.pipeline}")
+    print(f"Completed {len(completed)} requests in {elapsed:.2f}s ({len(completed) / elapsed:,.0f} req/s), "
+          f"{sum(1 for result in results if not result[2])} errors")
+
+    for kind in dict.fromkeys(kind for kind, _, _ in results):
+        latencies = sorted(latency for k, latency, _ in results if k == kind and latency is not None)
+        errors = sum(1 for k, _, ok in results if k == kind and not ok)
+        if not latencies:
+            print(f"{kind:>11}: {errors} errors")
+            continue
+        print(f"{kind:>11}: {len(latencies):6d} requests  {errors:5d} errors  "
+              f"p50 {statistics.median(latencies):7.1f}  p95 {percentile(latencies, 0.95):7.1f}  "
+              f"p99 {percentile(latencies, 0.99):7.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Speculative skill prefetching for the Voice Assistant
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+class SkillPrefetcher:
+    """Start likely skill lookups in the background before a command is routed"""
+
+    def __init__(self, max_workers=2, max_age=60):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self.max_age = max_age
+        self.fetchers = {}
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.stats = {"issued": 0, "hits": 0, "discarded": 0}
+
+    @staticmethod
+    def make_key(skill, argument):
+        """Normalize a skill lookup so 'New York' and 'new york' share an entry"""
+        return skill, str(argument).strip().lower()
+
+    def register(self, skill, fetcher):
+        """Register the function used to fetch data for a skill"""
+        self.fetchers[skill] = fetcher
+
+    def prefetch(self, skill, argument):
+        """Schedule a background fetch unless one is already in flight"""
+        fetcher = self.fetchers.get(skill)
+        if fetcher is None:
+            return False
+
+        key = self.make_key(skill, argument)
+        with self.lock:
+            entry = self.pending.get(key)
+            if entry and time.monotonic() - entry[1] < self.max_age:
+                return False
+            self.pending[key] = (self.executor.submit(fetcher, argument), time.monotonic())
+            self.stats["issued"] += 1
+        return True
+
+    def take(self, skill, argument, timeout=None):
+        """Return a prefetched result, or None if nothing usable was prefetched"""
+        with self.lock:
+            entry = self.pending.pop(self.make_key(skill, argument), None)
+        if entry is None:
+            return None
+
+        future, started = entry
+        if time.monotonic() - started > self.max_age:
+            future.cancel()
+            return None
+
+        try:
+            # A request already in flight is always closer to done than a new one
+            result = future.result(timeout=timeout)
+        except Exception:
+            return None
+
+        self.stats["hits"] += 1
+        return result
+
+    def cancel_unused(self):
+        """Drop prefetches the last command did not need"""
+        with self.lock:
+            entries = list(self.pending.values())
+            self.pending.clear()
+
+        # Running requests cannot be interrupted, but their results are discarded
+        for future, _ in entries:
+            future.cancel()
+            self.stats["discarded"] += 1
+
+    def shutdown(self):
+        """Cancel pending work and stop the worker threads"""
+        self.cancel_unused()
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,121 @@
+"""
+Dependency preflight for the Voice Assistant.
+
+Checks that required packages are present, and at what version, without
+importing them, and caches the result keyed on a fingerprint of the Python
+environment so a warm start only costs a few stat() calls.
+"""
+
+import hashlib
+import importlib
+import json
+import os
+import sys
+import time
+from importlib import util
+
+# module: import name, package: pip/distribution name
+REQUIREMENTS = [
+    {"module": "speech_recognition", "package": "SpeechRecognition", "required": True},
+    {"module": "pyttsx3", "package": "pyttsx3", "required": True},
+    {"module": "requests", "package": "requests", "required": True},
+    # Only needed for microphone input, not for headless mode
+    {"module": "pyaudio", "package": "PyAudio", "required": False},
+]
+
+CACHE_FILE = os.getenv(
+    'ASSISTANT_PREFLIGHT_CACHE',
+    os.path.join(os.path.expanduser("~"), ".cache", "voice_assistant", "preflight.json")
+)
+
+def environment_fingerprint():
+    """Hash of the interpreter and the modification times of its import path"""
+    parts = [sys.executable, sys.version]
+    for entry in sys.path:
+        try:
+            # Installing or removing a package changes its directory's mtime
+            parts.append(f"{entry}:{os.stat(entry or '.').st_mtime_ns}")
+        except OSError:
+            parts.append(f"{entry}:-")
+    parts.extend(f"{req['module']}={req['package']}" for req in REQUIREMENTS)
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+def check_requirement(requirement):
+    """Presence and version of one requirement, without importing it"""
+    # Only needed on a cold cache, and costly to import on every start
+    from importlib import metadata
+    present = util.find_spec(requirement["module"]) is not None
+    try:
+        version = metadata.version(requirement["package"])
+    except metadata.PackageNotFoundError:
+        version = None
+    return {**requirement, "present": present, "version": version}
+
+def load_cache(fingerprint):
+    try:
+        with open(CACHE_FILE, 'r') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cached.get("fingerprint") != fingerprint:
+        return None
+    return cached.get("results")
+
+def save_cache(fingerprint, results):
+    try:
+        os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+        temp_file = f"{CACHE_FILE}.{os.getpid()}.tmp"
+        with open(temp_file, 'w') as f:
+            json.dump({"fingerprint": fingerprint, "checked_at": time.time(), "results": results}, f)
+        os.replace(temp_file, CACHE_FILE)
+    except OSError as e:
+        print(f"Could not cache preflight results: {e}")
+
+def run_preflight(use_cache=True):
+    """Return the status of every requirement, from cache when the environment is unchanged"""
+    fingerprint = environment_fingerprint()
+    if use_cache:
+        results = load_cache(fingerprint)
+        if results is not None:
+            return results
+
+    results = [check_requirement(requirement) for requirement in REQUIREMENTS]
+    save_cache(fingerprint, results)
+    return results
+
+def missing_packages(results, include_optional=False):
+    """Pip names of requirements that are not installed"""
+    return [
+        result["package"] for result in results
+        if not result["present"] and (result["required"] or include_optional)
+    ]
+
+def install_packages(packages):
+    """Install packages in a single pip run so they are resolved together"""
+    if not packages:
+        return True
+    import subprocess
+    try:
+        subprocess.check_call([sys.executable, "-m", "pip", "install", *packages])
+        return True
+    except subprocess.CalledProcessError:
+        return False
+    finally:
+        # Let find_spec see the new packages; the changed site-packages
+        # mtimes already invalidate the preflight cache
+        importlib.invalidate_caches()
+
+def main():
+    """Print the preflight report"""
+    started = time.perf_counter()
+    results = run_preflight()
+    elapsed = (time.perf_counter() - started) * 1000
+
+    for result in results:
+        status = f"✓ {result['version'] or 'installed'}" if result["present"] else "✗ missing"
+        optional = "" if result["required"] else " (optional)"
+        print(f"{result['package']:<20} {status}{optional}")
+    print(f"\nPreflight took {elapsed:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""
+Circuit breakers, hedged requests and fallbacks for the external services
+the Voice Assistant depends on (weather API, speech recognition, SMTP)
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a service whose circuit is open"""
+
+class CircuitBreaker:
+    """Stop calling a service after repeated failures or slow responses"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name, failure_threshold=3, reset_timeout=30, slow_call_threshold=None, ignore=()):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.slow_call_threshold = slow_call_threshold
+        # Exceptions that mean "bad request", not "service unhealthy"
+        self.ignore = tuple(ignore)
+
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.last_error = None
+        self.average_latency = None
+        self.lock = threading.Lock()
+
+    def allow_request(self):
+        """Return True if a call may go through right now"""
+        with self.lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN:
+                # Let a single trial call probe the service; everyone else
+                # fails fast until it reports back
+                if self.probe_in_flight:
+                    return False
+                self.probe_in_flight = True
+            return True
+
+    def record_success(self, latency):
+        with self.lock:
+            self.probe_in_flight = False
+            self._track_latency(latency)
+            if self.slow_call_threshold and latency > self.slow_call_threshold:
+                self._trip(f"slow response ({latency:.2f}s)")
+                return
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self, error, latency):
+        with self.lock:
+            self.probe_in_flight = False
+            self._track_latency(latency)
+            self._trip(repr(error))
+
+    def _track_latency(self, latency):
+        if self.average_latency is None:
+            self.average_latency = latency
+        else:
+            self.average_latency = 0.8 * self.average_latency + 0.2 * latency
+
+    def _trip(self, reason):
+        self.last_error = reason
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def call(self, func, *args, **kwargs):
+        """Call func through the breaker, raising CircuitOpenError while open"""
+        if not self.allow_request():
+            raise CircuitOpenError(f"{self.name} is unavailable ({self.last_error})")
+
+        started = time.monotonic()
+        try:
+            result = func(*args, **kwargs)
+        except self.ignore:
+            self.record_success(time.monotonic() - started)
+            raise
+        except Exception as e:
+            self.record_failure(e, time.monotonic() - started)
+            raise
+
+        self.record_success(time.monotonic() - started)
+        return result
+
+    def health(self):
+        """Snapshot of the breaker state for status reporting"""
+        with self.lock:
+            return {
+                "state": self.state,
+                "failures": self.failures,
+                "last_error": self.last_error,
+                "average_latency": self.average_latency
+            }
+
+class ResilienceLayer:
+    """Shared registry of per-service breakers with hedging and fallbacks"""
+
+    def __init__(self):
+        self.breakers = {}
+
+    def register(self, name, **options):
+        """Create the breaker for a service; see CircuitBreaker for options"""
+        self.breakers[name] = CircuitBreaker(name, **options)
+        return self.breakers[name]
+
+    @staticmethod
+    def start_attempt(func, args, kwargs):
+        """
+        Run one attempt on its own thread.
+
+        A shared pool would make attempts queue behind each other under load,
+        and the queueing time would count towards hedge_delay and the
+        breaker's slow-call threshold.
+        """
+        future = Future()
+
+        def run():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(func(*args, **kwargs))
+            except Exception as e:
+                future.set_exception(e)
+
+        threading.Thread(target=run, name="hedge", daemon=True).start()
+        return future
+
+    def hedged(self, func, args, kwargs, hedge_delay, attempts):
+        """Start a backup request if the first one is slower than hedge_delay"""
+        futures = {self.start_attempt(func, args, kwargs)}
+        launched = 1
+        last_error = None
+
+        while futures:
+            timeout = hedge_delay if launched < attempts else None
+            done, futures = wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    last_error = e
+                    continue
+                # Stragglers cannot be interrupted; they finish on their own
+                # threads and their results are dropped
+                return result
+
+            # Either the wait timed out or an attempt failed: start another
+            if launched < attempts:
+                futures.add(self.start_attempt(func, args, kwargs))
+                launched += 1
+
+        raise last_error
+
+    def call(self, name, func, *args, fallback=None, hedge_delay=None, hedge_attempts=2, **kwargs):
+        """
+        Call func through the named breaker.
+
+        If the call fails or the circuit is open, fallback(error) is returned
+        instead when given, so the caller can answer with a degraded response.
+        """
+        breaker = self.breakers.get(name) or self.register(name)
+        try:
+            if hedge_delay is None:
+                return breaker.call(func, *args, **kwargs)
+            return breaker.call(self.hedged, func, args, kwargs, hedge_delay, hedge_attempts)
+        except breaker.ignore:
+            raise
+        except Exception as e:
+            if fallback is None:
+                raise
+            return fallback(e)
+
+    def health(self):
+        """Health of every registered service, keyed by name"""
+        return {name: breaker.health() for name, breaker in self.breakers.items()}
+
+    def degraded_services(self):
+        return [name for name, breaker in self.breakers.items() if breaker.state != CircuitBreaker.CLOSED]
+
+def main():
+    """Demonstrate breaker behaviour against a local stand-in service"""
+    import json
+    import urllib.request
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    behaviour = {"delay": 0.0, "fail": False, "stall_next": False}
+
+    class StandInHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if behaviour["stall_next"]:
+                behaviour["stall_next"] = False
+                time.sleep(0.9)
+            time.sleep(behaviour["delay"])
+            status = 503 if behaviour["fail"] else 200
+            body = json.dumps({"ok": status == 200}).encode()
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/"
+
+    def fetch():
+        with urllib.request.urlopen(url, timeout=1) as response:
+            return json.loads(response.read())
+
+    layer = ResilienceLayer()
+    layer.register("stand_in", failure_threshold=2, reset_timeout=1, slow_call_threshold=0.5)
+
+    print("Circuit breaker demo")
+    print("=" * 40)
+    # Hedging: a stalled first attempt is overtaken by the backup request
+    behaviour.update(stall_next=True)
+    started = time.perf_counter()
+    layer.call("stand_in", fetch, hedge_delay=0.1)
+    print(f"hedged call with a stalled first attempt took {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    steps = [("healthy", 0, False, 0), ("failing", 0, True, 0), ("failing", 0, True, 0),
+             ("open", 0, True, 0), ("recovered", 0, False, 1.1), ("slow", 0.8, False, 0),
+             ("slow", 0.8, False, 0), ("open", 0.8, False, 0)]
+    for label, delay, fail, pause in steps:
+        time.sleep(pause)
+        behaviour.update(delay=delay, fail=fail)
+        started = time.perf_counter()
+        result = layer.call("stand_in", fetch, fallback=lambda e: f"fallback ({type(e).__name__})")
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"{label:>9}: {result!s:<30} {elapsed:7.1f} ms  state={layer.health()['stand_in']['state']}")
+
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Precompiled, localized response templates for the Voice Assistant
+"""
+
+import random
+import time
+from datetime import datetime
+from string import Formatter
+
+# Templates are keyed by locale, then intent. Each intent has one or more
+# variants; {fields} are filled from the caller's values and the clock.
+RESPONSE_TEMPLATES = {
+    "en": {
+        "greeting": [
+            "Hello {name}! How can I help you?",
+            "Hi there! What can I do for you?",
+            "Hey! I'm here to assist you."
+        ],
+        "unknown": [
+            "I'm not sure how to help with that. Try saying 'help' to see what I can do.",
+            "I didn't understand that command. Can you try rephrasing?",
+            "Sorry, I don't know how to do that yet. Say 'help' for available commands."
+        ],
+        "time": ["The current time is {time}"],
+        "date": ["Today's date is {date}"],
+        "time_personal": ["{daypart} {name}! It's {time} on {long_date}"],
+        "time_long": ["It's {time} on {long_date}"],
+        "weather_lookup": ["Let me check the weather in {location} for you, {name}."],
+        "offer_help": ["How can I help you today, {name}?"],
+        "goodbye": ["Goodbye! Have a great day!"]
+    },
+    "es": {
+        "greeting": [
+            "¡Hola {name}! ¿En qué puedo ayudarte?",
+            "¡Hola! ¿Qué puedo hacer por ti?",
+            "¡Hola! Estoy aquí para ayudarte."
+        ],
+        "unknown": [
+            "No estoy seguro de cómo ayudar con eso. Di 'ayuda' para ver lo que puedo hacer.",
+            "No entendí ese comando. ¿Puedes decirlo de otra forma?"
+        ],
+        "time": ["Son las {time}"],
+        "date": ["Hoy es {date}"],
+        "time_personal": ["¡{daypart} {name}! Son las {time} del {long_date}"],
+        "time_long": ["Son las {time} del {long_date}"],
+        "weather_lookup": ["Voy a consultar el tiempo en {location} para ti, {name}."],
+        "offer_help": ["¿En qué puedo ayudarte hoy, {name}?"],
+        "goodbye": ["¡Adiós! ¡Que tengas un buen día!"]
+    }
+}
+
+# Names and clock formats per locale, so output does not depend on the process locale
+LOCALE_CLOCK = {
+    "en": {
+        "months": ["January", "February", "March", "April", "May", "June", "July",
+                   "August", "September", "October", "November", "December"],
+        "weekdays": ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"],
+        "dayparts": ["Good morning", "Good afternoon", "Good evening"],
+        "date": "{month} {day:02d}, {year}",
+        "long_date": "{weekday}, {month} {day:02d}",
+        "meridiem": ["AM", "PM"],
+        "time_12": "{hour:02d}:{minute:02d} {meridiem}",
+        "time_24": "{hour:02d}:{minute:02d}"
+    },
+    "es": {
+        "months": ["enero", "febrero", "marzo", "abril", "mayo", "junio", "julio",
+                   "agosto", "septiembre", "octubre", "noviembre", "diciembre"],
+        "weekdays": ["lunes", "martes", "miércoles", "jueves", "viernes", "sábado", "domingo"],
+        "dayparts": ["Buenos días", "Buenas tardes", "Buenas noches"],
+        "date": "{day} de {month} de {year}",
+        "long_date": "{weekday} {day} de {month}",
+        "meridiem": ["a. m.", "p. m."],
+        "time_12": "{hour}:{minute:02d} {meridiem}",
+        "time_24": "{hour:02d}:{minute:02d}"
+    }
+}
+
+CLOCK_FIELDS = {"time", "date", "long_date", "daypart"}
+
+class CompiledTemplate:
+    """A template parsed once into literal text and field names"""
+
+    def __init__(self, text):
+        self.parts = []
+        for literal, field, spec, conversion in Formatter().parse(text):
+            if spec or conversion:
+                raise ValueError(f"Format specs are not supported in response templates: {text!r}")
+            self.parts.append((literal, field))
+        self.fields = {field for _, field in self.parts if field}
+
+    def render(self, values):
+        return "".join(literal + (str(values[field]) if field else "") for literal, field in self.parts)
+
+class ClockFormatter:
+    """Time and date strings for one locale, recomputed at most once a minute"""
+
+    def __init__(self, locale, time_format="12"):
+        self.names = LOCALE_CLOCK[locale]
+        self.twelve_hour = str(time_format) != "24"
+        self.time_pattern = self.names["time_12" if self.twelve_hour else "time_24"]
+        self.cached_minute = None
+        self.values = {}
+
+    def current(self):
+        minute = int(time.time() // 60)
+        if minute != self.cached_minute:
+            self.values = self.format(datetime.now())
+            self.cached_minute = minute
+        return self.values
+
+    def format(self, now):
+        names = self.names
+        parts = {
+            "day": now.day,
+            "month": names["months"][now.month - 1],
+            "weekday": names["weekdays"][now.weekday()],
+            "year": now.year
+        }
+        if now.hour < 12:
+            daypart = names["dayparts"][0]
+        elif now.hour < 17:
+            daypart = names["dayparts"][1]
+        else:
+            daypart = names["dayparts"][2]
+
+        return {
+            "time": self.time_pattern.format(
+                hour=(now.hour % 12 or 12) if self.twelve_hour else now.hour,
+                minute=now.minute,
+                meridiem=names["meridiem"][now.hour >= 12]
+            ),
+            "date": names["date"].format(**parts),
+            "long_date": names["long_date"].format(**parts),
+            "daypart": daypart
+        }
+
+class ResponseTemplates:
+    """Render responses for an intent in the user's language and time format"""
+
+    def __init__(self, language="en-US", time_format="12", seed=None):
+        self.locale = self.resolve_locale(language)
+        self.templates = {
+            intent: [CompiledTemplate(text) for text in variants]
+            for intent, variants in RESPONSE_TEMPLATES[self.locale].items()
+        }
+        self.fallback = self.templates if self.locale == "en" else {
+            intent: [CompiledTemplate(text) for text in variants]
+            for intent, variants in RESPONSE_TEMPLATES["en"].items()
+        }
+        self.clock = ClockFormatter(self.locale, time_format)
+        self.random = random.Random(seed)
+
+    @staticmethod
+    def resolve_locale(language):
+        """Map a language tag like 'en-US' to a supported template locale"""
+        locale = (language or "en").split("-")[0].lower()
+        return locale if locale in RESPONSE_TEMPLATES else "en"
+
+    def render(self, intent, **values):
+        """Render one variant of the intent's template"""
+        variants = self.templates.get(intent) or self.fallback[intent]
+        template = variants[0] if len(variants) == 1 else self.random.choice(variants)
+
+        if template.fields & CLOCK_FIELDS:
+            values = {**self.clock.current(), **values}
+        return template.render(values)
+
+def main():
+    """Benchmark template rendering against building responses ad hoc"""
+    iterations = 200000
+
+    def ad_hoc(name):
+        current_hour = datetime.now().hour
+        if current_hour < 12:
+            greeting = "Good morning"
+        elif current_hour < 17:
+            greeting = "Good afternoon"
+        else:
+            greeting = "Good evening"
+        now = datetime.now()
+        return f"{greeting} {name}! It's {now.strftime('%I:%M %p')} on {now.strftime('%A, %B %d')}"
+
+    templates = ResponseTemplates(seed=0)
+
+    print("Response generation benchmark")
+    print("=" * 40)
+    for label, render in [("ad hoc f-strings", lambda: ad_hoc("User")),
+                          ("templates", lambda: templates.render("time_personal", name="User")),
+                          ("templates (greeting)", lambda: templates.render("greeting", name="User"))]:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            render()
+        elapsed = time.perf_counter() - started
+        print(f"{label:>22}: {iterations / elapsed:12,.0f} responses/sec")
+
+    print(f"\nSample: {templates.render('time_personal', name='User')}")
+    print(f"Sample (es, 24h): {ResponseTemplates('es-ES', '24').render('time_personal', name='Ana')}")
+
+if __name__ == "__main__":
+    main()
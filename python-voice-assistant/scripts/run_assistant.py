@@ -4,28 +4,16 @@ Main runner script for the Voice Assistant with enhanced error handling
 
 import sys
 import os
-from voice_assistant import VoiceAssistant
 from config import config
+from preflight import run_preflight, missing_packages
 
 def check_dependencies():
     """Check if all required packages are installed"""
-    required_packages = [
-        'speech_recognition',
-        'pyttsx3',
-        'requests'
-    ]
+    missing = missing_packages(run_preflight())
     
-    missing_packages = []
-    
-    for package in required_packages:
-        try:
-            __import__(package)
-        except ImportError:
-            missing_packages.append(package)
-    
-    if missing_packages:
+    if missing:
         print("Missing required packages:")
-        for package in missing_packages:
+        for package in missing:
             print(f"  - {package}")
         print("\nPlease install them using:")
         print("python setup_requirements.py")
@@ -85,13 +73,36 @@ def main():
         print("\nSetup cancelled.")
         return
     
-    # Start the assistant
+    # Start the assistant; imported only now that its dependencies are known to be present
+    from voice_assistant import VoiceAssistant
+    from responses import ResponseTemplates
     try:
-        assistant = VoiceAssistant()
+        # Replay needs no audio hardware, so the system microphone is never opened
+        microphone = None
+        if config.voice.replay_directory:
+            from audio_capture import ReplayMicrophone
+            microphone = ReplayMicrophone(config.voice.replay_directory)
+            print(f"Replaying audio from {config.voice.replay_directory}")
+        assistant = VoiceAssistant(microphone=microphone)
         
         # Apply user configuration
         assistant.user_name = config.user.name
         assistant.wake_word = config.voice.wake_word
+        assistant.default_location = config.user.default_location
+        assistant.responses = ResponseTemplates(config.user.language, config.user.time_format)
+        
+        if config.search.corpus_path:
+            from search_index import SearchIndex
+            assistant.search_index = SearchIndex.from_path(
+                config.search.corpus_path, min_score=config.search.min_score,
+                min_coverage=config.search.min_coverage, cache_size=config.search.cache_size
+            )
+            print(f"Loaded {len(assistant.search_index)} documents for local search")
+        
+        if config.voice.capture_directory:
+            from audio_capture import AudioRecorder
+            assistant.audio_recorder = AudioRecorder(config.voice.capture_directory)
+            print(f"Recording audio to {config.voice.capture_directory}")
         
         print("\nStarting voice assistant...")
         print("Say 'help' for available commands or 'exit' to quit.")
@@ -0,0 +1,202 @@
+"""
+Local full-text search for the Voice Assistant.
+
+An in-memory inverted index with BM25 ranking over a document corpus (for
+example an internal FAQ), with an LRU cache for repeated questions.
+
+A corpus is either a directory of .txt/.md files (the file name is the
+title) or a .jsonl file with one {"title": ..., "text": ...} object per line.
+"""
+
+import heapq
+import json
+import math
+import os
+import re
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from functools import lru_cache
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOP_WORDS = frozenset("""
+a an and are as at be by can do does for from how i in is it me my of on or
+please search tell the to what when where which who why with you your about
+""".split())
+
+def tokenize(text):
+    """Lower-case word tokens without stop words"""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOP_WORDS]
+
+def query_terms(query):
+    """Distinct query tokens, sorted since term order does not matter to BM25 and it helps the cache"""
+    return tuple(sorted(set(tokenize(query))))
+
+class SearchIndex:
+    """Inverted index over (title, text) documents ranked with BM25"""
+
+    def __init__(self, documents=(), k1=1.5, b=0.75, min_score=0.5, min_coverage=0.5, cache_size=1024):
+        self.k1 = k1
+        self.b = b
+        # A match is too weak to answer from below this score, or when the
+        # document has fewer than this share of the query's terms
+        self.min_score = min_score
+        self.min_coverage = min_coverage
+        self.titles = []
+        self.texts = []
+        self.lengths = array('I')
+        # term -> (document ids, term frequencies), kept as compact arrays
+        self.postings = {}
+        self.total_length = 0
+        # Per-document BM25 length normalization, rebuilt after documents are added
+        self.norms = None
+        self.search_cached = lru_cache(maxsize=cache_size)(self._search_terms)
+        for title, text in documents:
+            self.add(title, text)
+
+    @classmethod
+    def from_path(cls, path, **options):
+        """Build an index from a corpus directory or .jsonl file"""
+        return cls(load_corpus(path), **options)
+
+    def __len__(self):
+        return len(self.titles)
+
+    def add(self, title, text):
+        doc_id = len(self.titles)
+        self.titles.append(title)
+        self.texts.append(text)
+
+        counts = Counter(tokenize(f"{title} {text}"))
+        length = sum(counts.values())
+        self.lengths.append(length)
+        self.total_length += length
+
+        for term, frequency in counts.items():
+            posting = self.postings.get(term)
+            if posting is None:
+                posting = self.postings[term] = (array('I'), array('I'))
+            posting[0].append(doc_id)
+            posting[1].append(frequency)
+
+        # Adding a document changes every score
+        self.norms = None
+        self.search_cached.cache_clear()
+
+    def search(self, query, limit=3):
+        """Return up to `limit` (score, title, text) results for a query"""
+        results = self.search_cached(query_terms(query), limit)
+        return [(score, self.titles[doc_id], self.texts[doc_id]) for score, doc_id in results]
+
+    def _search_terms(self, terms, limit):
+        if not terms or not self.titles:
+            return []
+
+        count = len(self.titles)
+        if self.norms is None:
+            average_length = self.total_length / count or 1
+            self.norms = [self.k1 * (1 - self.b + self.b * length / average_length) for length in self.lengths]
+        norms, k1 = self.norms, self.k1
+        scores = {}
+
+        for term in terms:
+            posting = self.postings.get(term)
+            if posting is None:
+                continue
+            doc_ids, frequencies = posting
+            idf = math.log(1 + (count - len(doc_ids) + 0.5) / (len(doc_ids) + 0.5))
+            weight = idf * (k1 + 1)
+            for doc_id, frequency in zip(doc_ids, frequencies):
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight * frequency / (frequency + norms[doc_id])
+
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [(score, doc_id) for doc_id, score in best]
+
+    def coverage(self, terms, doc_id):
+        """Share of the query terms that occur in a document"""
+        matched = 0
+        for term in terms:
+            posting = self.postings.get(term)
+            if posting is not None:
+                # Document ids are appended in order, so each posting is sorted
+                doc_ids = posting[0]
+                position = bisect_left(doc_ids, doc_id)
+                matched += position < len(doc_ids) and doc_ids[position] == doc_id
+        return matched / len(terms)
+
+    def answer(self, query, max_length=240):
+        """A speakable answer from the best local match, or None if nothing matches well"""
+        terms = query_terms(query)
+        results = self.search_cached(terms, 1)
+        if not results:
+            return None
+        # One rare term can outscore everything else, so a strong match must
+        # also cover enough of what was asked
+        score, doc_id = results[0]
+        if score < self.min_score or self.coverage(terms, doc_id) < self.min_coverage:
+            return None
+
+        title, text = self.titles[doc_id], self.texts[doc_id]
+        snippet = " ".join(text.split())
+        if len(snippet) > max_length:
+            # Cut at the last sentence end, else the last word, within the limit
+            cut = snippet.rfind(". ", 0, max_length)
+            snippet = snippet[:cut + 1] if cut > 0 else snippet[:max_length].rsplit(" ", 1)[0] + "..."
+        return f"According to {title}: {snippet}"
+
+def load_corpus(path):
+    """Yield (title, text) pairs from a corpus directory or .jsonl file"""
+    if os.path.isdir(path):
+        for root, _, files in os.walk(path):
+            for name in sorted(files):
+                if name.endswith(('.txt', '.md')):
+                    with open(os.path.join(root, name), 'r', encoding='utf-8') as f:
+                        yield os.path.splitext(name)[0].replace('_', ' '), f.read()
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    document = json.loads(line)
+                    yield document.get('title', ''), document.get('text', '')
+
+def main():
+    """Benchmark index build and query latency on a synthetic 100k document corpus"""
+    import random
+    import statistics
+
+    rng = random.Random(0)
+    # Zipf-like vocabulary so term frequencies resemble real text
+    vocabulary = [f"term{i}" for i in range(50000)]
+    cumulative, total = [], 0.0
+    for rank in range(len(vocabulary)):
+        total += 1 / (rank + 1)
+        cumulative.append(total)
+
+    def make_text(words):
+        return " ".join(rng.choices(vocabulary, cum_weights=cumulative, k=words))
+
+    documents = [(f"Document {i}", make_text(60)) for i in range(100000)]
+    queries = [make_text(3) for _ in range(200)]
+
+    started = time.perf_counter()
+    index = SearchIndex(documents)
+    build_time = time.perf_counter() - started
+
+    def timed(query):
+        started = time.perf_counter()
+        index.search(query)
+        return (time.perf_counter() - started) * 1000
+
+    cold = [timed(query) for query in queries]
+    warm = [timed(query) for query in queries]
+
+    print(f"Search index benchmark: {len(index):,} documents, {len(index.postings):,} terms")
+    print("=" * 50)
+    print(f"Build:        {build_time:.2f}s ({len(index) / build_time:,.0f} docs/s)")
+    print(f"Query:        median {statistics.median(cold):.2f} ms, max {max(cold):.2f} ms")
+    print(f"Cached query: median {statistics.median(warm) * 1000:.1f} us")
+
+if __name__ == "__main__":
+    main()
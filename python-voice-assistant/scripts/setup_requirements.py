@@ -2,39 +2,34 @@
 Setup script to install required packages for the Voice Assistant
 """
 
-import subprocess
-import sys
-
-def install_package(package):
-    """Install a package using pip"""
-    try:
-        subprocess.check_call([sys.executable, "-m", "pip", "install", package])
-        print(f"✓ Successfully installed {package}")
-        return True
-    except subprocess.CalledProcessError:
-        print(f"✗ Failed to install {package}")
-        return False
+from preflight import REQUIREMENTS, run_preflight, missing_packages, install_packages
 
 def main():
     """Install all required packages"""
     print("Setting up Voice Assistant requirements...")
     print("=" * 50)
     
-    required_packages = [
-        "speechrecognition",
-        "pyttsx3",
-        "requests",
-        "pyaudio"  # Required for microphone input
-    ]
-    
-    success_count = 0
+    required_packages = [requirement["package"] for requirement in REQUIREMENTS]
     
-    for package in required_packages:
-        print(f"Installing {package}...")
-        if install_package(package):
-            success_count += 1
+    # Skip what is already installed and resolve the rest in one pip run
+    missing = missing_packages(run_preflight(), include_optional=True)
+    if missing:
+        print(f"Installing {', '.join(missing)}...")
+        if not install_packages(missing):
+            # An optional package that fails to build (often pyaudio) would
+            # otherwise block the whole batch
+            required = missing_packages(run_preflight())
+            if required and required != missing:
+                print(f"Retrying without optional packages: {', '.join(required)}...")
+                install_packages(required)
         print()
     
+    results = run_preflight()
+    for result in results:
+        mark = "✓" if result["present"] else "✗"
+        print(f"{mark} {result['package']} {result['version'] or ''}".rstrip())
+    success_count = sum(1 for result in results if result["present"])
+    
     print("=" * 50)
     print(f"Installation complete: {success_count}/{len(required_packages)} packages installed successfully")
     
@@ -0,0 +1,16 @@
+"""
+Local stand-in for online speech recognition, for benchmarks and load tests
+"""
+
+import time
+
+class StubRecognizer:
+    """Replaces Recognizer.recognize_google: a fixed transcript after a delay"""
+
+    def __init__(self, transcript="what time is it", delay=0.3):
+        self.transcript = transcript
+        self.delay = delay
+
+    def __call__(self, audio):
+        time.sleep(self.delay)
+        return self.transcript
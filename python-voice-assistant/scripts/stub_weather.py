@@ -0,0 +1,37 @@
+"""
+Local stand-in for the OpenWeatherMap API, for benchmarks and load tests
+"""
+
+import json
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class StubWeatherHandler(BaseHTTPRequestHandler):
+    """Answers like OpenWeatherMap after the server's configured delay"""
+
+    def do_GET(self):
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+        time.sleep(self.server.delay)
+        body = json.dumps({
+            "name": query.get("q", [""])[0],
+            "main": {"temp": 18.5},
+            "weather": [{"description": "clear sky"}]
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_stub_weather(delay, host="127.0.0.1", port=0):
+    """Serve the stub on a background thread; returns (server, weather_api_url)"""
+    server = ThreadingHTTPServer((host, port), StubWeatherHandler)
+    server.daemon_threads = True
+    server.delay = delay
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_port}/data/2.5/weather"
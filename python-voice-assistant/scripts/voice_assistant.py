@@ -1,53 +1,114 @@
 import speech_recognition as sr
 import pyttsx3
-import datetime
 import webbrowser
 import requests
 import json
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+import io
 import os
+import re
+import tempfile
 import threading
 import time
+import urllib.parse
+from prefetch import SkillPrefetcher
+from audio_capture import ReplayMicrophone
+from resilience import ResilienceLayer, CircuitOpenError
+from responses import ResponseTemplates
 
 class VoiceAssistant:
-    def __init__(self):
+    def __init__(self, headless=False, microphone=None):
+        # Headless mode skips audio devices; responses go to the caller's sink
+        self.headless = headless
+        self.output = threading.local()
+        self.tts_lock = threading.Lock()
+        
         # Initialize speech recognition and text-to-speech
         self.recognizer = sr.Recognizer()
-        try:
-            self.microphone = sr.Microphone()
-        except OSError as e:
-            print(f"Microphone not found or not accessible: {e}")
-            self.microphone = None
-        self.tts_engine = pyttsx3.init()
-        
-        # Configure TTS settings
-        self.tts_engine.setProperty('rate', 150)
-        self.tts_engine.setProperty('volume', 0.9)
+        # Bound recognition requests so a stalled API counts as a failure
+        self.recognizer.operation_timeout = 5
+        # Online recognizer; load tests swap in a stub_speech.StubRecognizer
+        self.recognize_online = self.recognizer.recognize_google
+        # Any sr.AudioSource, e.g. an audio_capture.ReplayMicrophone; the
+        # system microphone is only opened when none is given
+        self.microphone = microphone
+        self.tts_engine = None
+        if not headless:
+            if self.microphone is None:
+                try:
+                    self.microphone = sr.Microphone()
+                except (OSError, AttributeError) as e:
+                    # AttributeError is how speech_recognition reports a missing PyAudio
+                    print(f"Microphone not found or not accessible: {e}")
+            try:
+                self.init_tts()
+            except Exception as e:
+                print(f"Text-to-speech not available, responses will only be printed: {e}")
+        # Set to an AudioRecorder to save every captured utterance to disk
+        self.audio_recorder = None
         
         # User preferences
         self.user_name = "User"
         self.wake_word = "hello assistant"
+        self.default_location = "New York"
+        self.last_command = ""
+        self.responses = ResponseTemplates()
+        # Optional search_index.SearchIndex answered from before the browser
+        self.search_index = None
         
         # API keys (you would set these as environment variables)
         self.weather_api_key = os.getenv('WEATHER_API_KEY')
         if not self.weather_api_key:
             print("Warning: WEATHER_API_KEY environment variable not set.")
             self.weather_api_key = None
+        self.weather_api_url = "http://api.openweathermap.org/data/2.5/weather"
         
         self.email_password = os.getenv('EMAIL_PASSWORD')
         if not self.email_password:
             print("Warning: EMAIL_PASSWORD environment variable not set.")
             self.email_password = None
+        self.smtp_server = "smtp.gmail.com"
+        self.smtp_port = 587
+        
+        # Circuit breakers for external services, so an outage costs one
+        # timeout instead of one per command
+        self.resilience = ResilienceLayer()
+        self.resilience.register('weather', failure_threshold=3, reset_timeout=30, slow_call_threshold=3)
+        self.resilience.register('speech', failure_threshold=2, reset_timeout=60, slow_call_threshold=4,
+                                 ignore=(sr.UnknownValueError,))
+        self.resilience.register('smtp', failure_threshold=2, reset_timeout=120,
+                                 ignore=(smtplib.SMTPAuthenticationError, smtplib.SMTPRecipientsRefused))
+        self.weather_cache = {}
+        
+        # Background lookups started while the user is still speaking
+        self.prefetcher = SkillPrefetcher()
+        self.prefetcher.register('weather', self.fetch_weather_resilient)
         
         print("Voice Assistant initialized successfully!")
-        self.speak("Hello! I'm your voice assistant. How can I help you today?")
+        if not headless:
+            self.speak("Hello! I'm your voice assistant. How can I help you today?")
+
+    def init_tts(self):
+        """Create and configure the text-to-speech engine"""
+        self.tts_engine = pyttsx3.init()
+        
+        # Configure TTS settings
+        self.tts_engine.setProperty('rate', 150)
+        self.tts_engine.setProperty('volume', 0.9)
 
     def speak(self, text):
         """Convert text to speech"""
+        sink = getattr(self.output, 'sink', None)
+        if sink is not None:
+            sink(text)
+            return
+        
         try:
             print(f"Assistant: {text}")
+            if self.tts_engine is None:
+                return
             self.tts_engine.say(text)
             self.tts_engine.runAndWait()
         except Exception as e:
@@ -58,13 +119,24 @@ class VoiceAssistant:
         try:
             with self.microphone as source:
                 print("Listening...")
-                # Adjust for ambient noise
-                self.recognizer.adjust_for_ambient_noise(source, duration=1)
+                if isinstance(source, ReplayMicrophone) and source.energy_threshold:
+                    # Replay the recorded threshold instead of consuming audio to calibrate
+                    self.recognizer.energy_threshold = source.energy_threshold
+                else:
+                    # Adjust for ambient noise
+                    self.recognizer.adjust_for_ambient_noise(source, duration=1)
+                # listen() adapts the threshold while it runs, so keep the starting value for replay
+                capture_threshold = self.recognizer.energy_threshold
                 # Listen for audio
                 audio = self.recognizer.listen(source, timeout=5, phrase_time_limit=10)
             
-            # Recognize speech using Google's speech recognition
-            command = self.recognizer.recognize_google(audio).lower()
+            command = None
+            try:
+                command = self.transcribe(audio)
+            finally:
+                # Saved with the transcript (None if recognition failed) so replays can check accuracy
+                if self.audio_recorder:
+                    self.audio_recorder.record(audio, capture_threshold, transcript=command)
             print(f"You said: {command}")
             return command
             
@@ -78,47 +150,154 @@ class VoiceAssistant:
             print(f"Could not request results; {e}")
             return ""
 
+    def transcribe(self, audio):
+        """Recognize speech using Google's speech recognition, offline if it is down"""
+        return self.resilience.call(
+            'speech', self.recognize_online, audio,
+            fallback=lambda error: self.recognize_offline(audio, error)
+        ).lower()
+
+    def transcribe_wav(self, wav_data):
+        """Transcribe a WAV/AIFF/FLAC payload instead of microphone input"""
+        with sr.AudioFile(io.BytesIO(wav_data)) as source:
+            audio = self.recognizer.record(source)
+        return self.transcribe(audio)
+
+    def synthesize(self, text):
+        """Render speech to WAV bytes instead of playing it"""
+        # pyttsx3 engines are not thread-safe, so synthesis is serialized
+        with self.tts_lock:
+            if self.tts_engine is None:
+                self.init_tts()
+            fd, path = tempfile.mkstemp(suffix=".wav")
+            os.close(fd)
+            try:
+                self.tts_engine.save_to_file(text, path)
+                self.tts_engine.runAndWait()
+                with open(path, 'rb') as f:
+                    return f.read()
+            finally:
+                os.remove(path)
+
+    def respond(self, command, sink):
+        """Process a command, sending each response to sink instead of the speaker"""
+        self.output.sink = sink
+        try:
+            return self.process_command(command) is not False
+        finally:
+            self.output.sink = None
+
+    def recognize_offline(self, audio, error):
+        """Fall back to offline recognition when the online service is unavailable"""
+        print(f"Online speech recognition unavailable ({error}), trying offline recognition")
+        try:
+            return self.recognizer.recognize_sphinx(audio)
+        except sr.RequestError:
+            # pocketsphinx is not installed
+            raise sr.RequestError(f"Speech service unavailable and no offline recognizer installed: {error}")
+
     def get_current_time(self):
         """Get current time"""
-        now = datetime.datetime.now()
-        time_string = now.strftime("%I:%M %p")
-        return f"The current time is {time_string}"
+        return self.responses.render('time')
 
     def get_current_date(self):
         """Get current date"""
-        today = datetime.date.today()
-        date_string = today.strftime("%B %d, %Y")
-        return f"Today's date is {date_string}"
+        return self.responses.render('date')
 
     def search_web(self, query):
-        """Search the web using default browser"""
+        """Answer from the local search index, falling back to the default browser"""
         try:
-            search_url = f"https://www.google.com/search?q={query.replace(' ', '+')}"
+            if self.search_index is not None:
+                answer = self.search_index.answer(query)
+                if answer:
+                    return answer
+            if self.headless:
+                return f"I couldn't find anything about {query}."
+            
+            search_url = "https://www.google.com/search?" + urllib.parse.urlencode({'q': query})
             webbrowser.open(search_url)
             return f"Searching the web for {query}"
         except Exception as e:
             return f"Error searching the web: {e}"
 
-    def get_weather(self, city="New York"):
+    def fetch_weather(self, city):
+        """Fetch and describe the weather for a city from OpenWeatherMap"""
+        params = {'q': city, 'appid': self.weather_api_key, 'units': 'metric'}
+        response = requests.get(self.weather_api_url, params=params, timeout=5)
+        # Server errors mean the service is unhealthy; 4xx means a bad city or key
+        if response.status_code >= 500:
+            response.raise_for_status()
+        data = response.json()
+        
+        if response.status_code == 200:
+            temp = data['main']['temp']
+            description = data['weather'][0]['description']
+            report = f"The weather in {city} is {description} with a temperature of {temp} degrees Celsius"
+            self.weather_cache[city.lower()] = (report, time.time())
+            return report
+        else:
+            return f"Could not get weather information for {city}"
+
+    def fetch_weather_resilient(self, city):
+        """Fetch weather through the circuit breaker, serving cached weather if the API is down"""
+        return self.resilience.call('weather', self.fetch_weather, city, hedge_delay=1.5,
+                                    fallback=lambda error: self.cached_weather(city))
+
+    def cached_weather(self, city):
+        """Degraded weather answer from the last successful lookup"""
+        cached = self.weather_cache.get(city.lower())
+        if cached:
+            report, fetched_at = cached
+            minutes = int((time.time() - fetched_at) / 60)
+            return f"The weather service is not responding. {minutes} minutes ago, {report[0].lower()}{report[1:]}"
+        return f"The weather service is not responding right now, so I can't check {city}. Please try again later."
+
+    def get_weather(self, city=None):
         """Get weather information (requires API key)"""
+        city = city or self.default_location
         try:
-            if self.weather_api_key == 'your_weather_api_key':
+            if not self.weather_configured():
                 return "Weather API key not configured. Please set your OpenWeatherMap API key."
             
-            url = f"http://api.openweathermap.org/data/2.5/weather?q={city}&appid={self.weather_api_key}&units=metric"
-            response = requests.get(url, timeout=5)
-            data = response.json()
-            
-            if response.status_code == 200:
-                temp = data['main']['temp']
-                description = data['weather'][0]['description']
-                return f"The weather in {city} is {description} with a temperature of {temp} degrees Celsius"
-            else:
-                return f"Could not get weather information for {city}"
+            prefetched = self.prefetcher.take('weather', city)
+            if prefetched is not None:
+                return prefetched
+            return self.fetch_weather_resilient(city)
                 
         except Exception as e:
             return f"Error getting weather: {e}"
 
+    def extract_city(self, command):
+        """Extract the city from a weather command, falling back to the default location"""
+        match = re.search(r"\bin\s+([a-z .'-]+?)(?:\s+(?:today|tomorrow|tonight|now|later))?\s*$", command)
+        if match and match.group(1).strip():
+            return match.group(1).strip()
+        return self.default_location
+
+    def weather_configured(self):
+        """True if a real OpenWeatherMap key is set"""
+        return bool(self.weather_api_key) and self.weather_api_key != 'your_weather_api_key'
+
+    def anticipate(self, context):
+        """Speculatively prefetch data the next command is likely to need"""
+        # Without a key every speculative request is bound to fail
+        if not context or not self.weather_configured():
+            return
+        
+        # Weather questions tend to come in runs ("and tomorrow?"), and greetings
+        # are usually followed by the morning weather check
+        if any(word in context for word in ['weather', 'temperature', 'forecast']):
+            self.prefetcher.prefetch('weather', self.extract_city(context))
+        elif any(word in context for word in ['hello', 'good morning']):
+            self.prefetcher.prefetch('weather', self.default_location)
+
+    def end_turn(self, command):
+        """Discard prefetches this turn did not use and anticipate the next one"""
+        self.last_command = command
+        self.prefetcher.cancel_unused()
+        # Once per turn, so idle listen timeouts do not keep re-fetching
+        self.anticipate(command)
+
     def send_email(self, recipient, subject, body):
         """Send email (requires email configuration)"""
         import smtplib
@@ -136,15 +315,11 @@ class VoiceAssistant:
             message["Subject"] = subject
             message.attach(MIMEText(body, "plain"))
             
-            # Gmail SMTP configuration
-            server = smtplib.SMTP("smtp.gmail.com", 587)
-            server.starttls()
-            server.login(sender_email, self.email_password)
-            server.send_message(message)
-            server.quit()
-            
+            self.resilience.call('smtp', self.deliver_email, sender_email, message)
             return f"Email sent successfully to {recipient}"
             
+        except CircuitOpenError:
+            return "The email server is not responding right now. Please try again later."
         except SMTPAuthenticationError:
             return "SMTP Authentication Error: Check your email and password."
         except SMTPConnectError:
@@ -156,6 +331,25 @@ class VoiceAssistant:
         except Exception as e:
             return f"Error sending email: {e}"
 
+    def deliver_email(self, sender_email, message):
+        """Send a prepared message over SMTP"""
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=10)
+        try:
+            server.starttls()
+            server.login(sender_email, self.email_password)
+            server.send_message(message)
+        except Exception:
+            server.close()
+            raise
+        server.quit()
+
+    def service_status(self):
+        """Describe which external services are currently degraded"""
+        degraded = self.resilience.degraded_services()
+        if not degraded:
+            return "All services are working normally."
+        return f"These services are having trouble right now: {', '.join(degraded)}."
+
     def set_reminder(self, message, delay_minutes):
         """Set a reminder (simple implementation)"""
         def reminder_thread():
@@ -203,13 +397,7 @@ class VoiceAssistant:
         
         # Basic greetings
         if any(word in command for word in ['hello', 'hi', 'hey']):
-            responses = [
-                f"Hello {self.user_name}! How can I help you?",
-                "Hi there! What can I do for you?",
-                "Hey! I'm here to assist you."
-            ]
-            import random
-            self.speak(random.choice(responses))
+            self.speak(self.responses.render('greeting', name=self.user_name))
         
         # Time queries
         elif any(word in command for word in ['time', 'clock']):
@@ -239,12 +427,7 @@ class VoiceAssistant:
         
         # Weather queries
         elif 'weather' in command:
-            city = "New York"  # Default city
-            if 'in' in command:
-                parts = command.split('in')
-                if len(parts) > 1:
-                    city = parts[1].strip()
-            
+            city = self.extract_city(command)
             response = self.get_weather(city)
             self.speak(response)
         
@@ -255,7 +438,10 @@ class VoiceAssistant:
         # Reminder functionality
         elif 'remind me' in command or 'reminder' in command:
             message, minutes = self.parse_reminder_command(command)
-            if message and minutes:
+            if self.headless:
+                # The reminder would fire after the request has finished, with nobody to hear it
+                self.speak("Reminders aren't available here because I can't reach you when they're due.")
+            elif message and minutes:
                 response = self.set_reminder(message, minutes)
                 self.speak(response)
             else:
@@ -263,9 +449,13 @@ class VoiceAssistant:
         
         # Exit commands
         elif any(word in command for word in ['exit', 'quit', 'goodbye', 'bye']):
-            self.speak("Goodbye! Have a great day!")
+            self.speak(self.responses.render('goodbye'))
             return False
         
+        # Service health
+        elif 'status' in command:
+            self.speak(self.service_status())
+        
         # Help command
         elif 'help' in command:
             help_text = """
@@ -283,17 +473,14 @@ class VoiceAssistant:
             'Remind me to call mom in 30 minutes'
             """
             self.speak("Here's what I can do for you:")
-            print(help_text)
+            if self.headless:
+                self.speak(" ".join(help_text.split()))
+            else:
+                print(help_text)
         
         # Unknown command
         else:
-            responses = [
-                "I'm not sure how to help with that. Try saying 'help' to see what I can do.",
-                "I didn't understand that command. Can you try rephrasing?",
-                "Sorry, I don't know how to do that yet. Say 'help' for available commands."
-            ]
-            import random
-            self.speak(random.choice(responses))
+            self.speak(self.responses.render('unknown'))
         
         return True
 
@@ -308,7 +495,12 @@ class VoiceAssistant:
                     should_continue = self.process_command(command)
                     if should_continue is False:
                         break
+                    self.end_turn(command)
                 
+            except EOFError as e:
+                # Replayed audio has run out
+                print(f"\n{e}")
+                break
             except KeyboardInterrupt:
                 print("\nShutting down...")
                 self.speak("Goodbye!")
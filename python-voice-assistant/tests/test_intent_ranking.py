@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+from config import AssistantConfig
+from intent_ranking import IntentRanker
+
+INTENTS = ["time_query", "weather_query", "smart_home"]
+
+def test_frequent_intent_moves_up():
+    ranker = IntentRanker(INTENTS, {})
+    assert ranker.order == INTENTS
+
+    for _ in range(3):
+        ranker.record("smart_home")
+    ranker.record("weather_query")
+    assert ranker.order == ["smart_home", "weather_query", "time_query"]
+    assert ranker.order == ranker.rank()
+
+def test_old_usage_decays():
+    ranker = IntentRanker(INTENTS, {}, half_life=2)
+    for _ in range(3):
+        ranker.record("time_query")
+    for _ in range(4):
+        ranker.record("smart_home")
+    # Four recent uses outweigh three that have halved twice since
+    assert ranker.order[0] == "smart_home"
+
+def test_rivals_lower_confidence():
+    ranker = IntentRanker(INTENTS, {})
+    for _ in range(10):
+        ranker.record("smart_home")
+    alone = ranker.confidence("smart_home")
+    assert ranker.confidence("smart_home", ["weather_query"]) < alone
+    assert ranker.confidence("weather_query", ["smart_home"]) < 0.5
+
+def test_static_order_ignores_history():
+    ranker = IntentRanker(INTENTS, {"turn": 5, "intents": {"smart_home": [5.0, 5]}}, adaptive=False)
+    assert ranker.order == INTENTS
+    assert ranker.confidence("smart_home") == 0.5
+
+def test_learned_order_survives_profile_round_trip(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    profile = AssistantConfig()
+    ranker = IntentRanker(INTENTS, profile.intent_stats)
+    for intent in ["weather_query"] * 2 + ["smart_home"] * 5 + ["weather_query"]:
+        ranker.record(intent)
+    profile.save_user_config()
+
+    saved = json.loads((tmp_path / "user_config.json").read_text())
+    assert saved["intent_stats"]["turn"] == 8
+
+    reloaded = IntentRanker(INTENTS, AssistantConfig().intent_stats)
+    assert reloaded.order == ranker.order == ["smart_home", "weather_query", "time_query"]
+    assert reloaded.confidence("smart_home") == ranker.confidence("smart_home")
+
+def test_router_flags_ambiguous_commands():
+    pytest.importorskip("requests")
+    from advanced_features import AdvancedVoiceAssistant
+
+    assistant = AdvancedVoiceAssistant(intent_stats={})
+    for _ in range(20):
+        assistant.natural_language_processing("turn on the kitchen lights")
+
+    clear = assistant.natural_language_processing("turn off the bedroom light")
+    assert clear["intent"] == "smart_home"
+    assert clear["alternatives"] == []
+
+    # A habitual intent that matches later in the phrase does not take over
+    reminder = assistant.natural_language_processing("remind me to turn off the oven")
+    assert reminder["intent"] == "reminder_intent"
+    assert reminder["alternatives"] == ["smart_home"]
+    assert reminder["confidence"] < 0.5
+
+    search = assistant.natural_language_processing("look up what time the pharmacy closes")
+    assert search["intent"] == "search_query"
+    assert search["alternatives"] == ["time_query"]
+
+    heating = assistant.natural_language_processing("set the temperature to 21 for today")
+    assert heating["intent"] == "smart_home"
+    assert heating["alternatives"] == ["weather_query"]
+
+def test_usage_breaks_ties_between_matches():
+    pytest.importorskip("requests")
+    from advanced_features import AdvancedVoiceAssistant
+
+    assistant = AdvancedVoiceAssistant(intent_stats={})
+    # Both patterns match from the first word, so only usage can decide
+    assert assistant.natural_language_processing("what's the date and time")["intent"] == "time_query"
+    for _ in range(5):
+        assistant.natural_language_processing("current date please")
+    tie = assistant.natural_language_processing("what's the date and time")
+    assert tie["intent"] == "date_query"
+    assert tie["alternatives"] == ["time_query"]
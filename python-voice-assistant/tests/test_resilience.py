@@ -0,0 +1,201 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from resilience import CircuitBreaker, CircuitOpenError, ResilienceLayer
+
+class StandInService:
+    """Local HTTP server whose delay and failures can be changed between calls"""
+
+    def __init__(self):
+        self.delay = 0.0
+        self.fail = False
+        self.stall_next = 0.0
+        self.requests = 0
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                service.requests += 1
+                stall, service.stall_next = service.stall_next, 0.0
+                time.sleep(stall or service.delay)
+                status = 503 if service.fail else 200
+                body = json.dumps({"ok": status == 200}).encode()
+                self.send_response(status)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        # Room for every concurrent test client, so none waits on a SYN retry
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler, bind_and_activate=False)
+        self.server.daemon_threads = True
+        self.server.request_queue_size = 64
+        self.server.server_bind()
+        self.server.server_activate()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def fetch(self):
+        with urllib.request.urlopen(self.url, timeout=2) as response:
+            return json.loads(response.read())
+
+@pytest.fixture
+def service():
+    service = StandInService()
+    yield service
+    service.server.shutdown()
+    service.server.server_close()
+
+def test_breaker_opens_after_failure_threshold(service):
+    layer = ResilienceLayer()
+    breaker = layer.register("svc", failure_threshold=3, reset_timeout=60)
+    service.fail = True
+
+    for _ in range(2):
+        with pytest.raises(urllib.error.HTTPError):
+            layer.call("svc", service.fetch)
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    with pytest.raises(urllib.error.HTTPError):
+        layer.call("svc", service.fetch)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    # Open: the service is not called at all
+    requests = service.requests
+    with pytest.raises(CircuitOpenError):
+        layer.call("svc", service.fetch)
+    assert service.requests == requests
+
+def test_fallback_returned_while_open(service):
+    layer = ResilienceLayer()
+    layer.register("svc", failure_threshold=1, reset_timeout=60)
+    service.fail = True
+    layer.call("svc", service.fetch, fallback=lambda error: "cached")
+
+    service.fail = False
+    started = time.monotonic()
+    result = layer.call("svc", service.fetch, fallback=lambda error: f"cached after {type(error).__name__}")
+    assert result == "cached after CircuitOpenError"
+    assert time.monotonic() - started < 0.05
+    assert layer.degraded_services() == ["svc"]
+
+def test_slow_calls_trip_breaker(service):
+    layer = ResilienceLayer()
+    breaker = layer.register("svc", failure_threshold=2, reset_timeout=60, slow_call_threshold=0.1)
+    service.delay = 0.2
+
+    # Slow responses are still returned, but count as failures
+    assert layer.call("svc", service.fetch) == {"ok": True}
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert layer.call("svc", service.fetch) == {"ok": True}
+    assert breaker.state == CircuitBreaker.OPEN
+    assert "slow response" in breaker.health()["last_error"]
+
+def test_recovers_after_reset_timeout(service):
+    layer = ResilienceLayer()
+    breaker = layer.register("svc", failure_threshold=1, reset_timeout=0.2)
+    service.fail = True
+    with pytest.raises(urllib.error.HTTPError):
+        layer.call("svc", service.fetch)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    service.fail = False
+    with pytest.raises(CircuitOpenError):
+        layer.call("svc", service.fetch)
+
+    time.sleep(0.25)
+    assert layer.call("svc", service.fetch) == {"ok": True}
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_failed_probe_reopens(service):
+    layer = ResilienceLayer()
+    breaker = layer.register("svc", failure_threshold=1, reset_timeout=0.1)
+    service.fail = True
+    with pytest.raises(urllib.error.HTTPError):
+        layer.call("svc", service.fetch)
+
+    time.sleep(0.15)
+    with pytest.raises(urllib.error.HTTPError):
+        layer.call("svc", service.fetch)
+    assert breaker.state == CircuitBreaker.OPEN
+
+def test_half_open_allows_single_probe(service):
+    layer = ResilienceLayer()
+    breaker = layer.register("svc", failure_threshold=1, reset_timeout=0.1)
+    service.fail = True
+    with pytest.raises(urllib.error.HTTPError):
+        layer.call("svc", service.fetch)
+    time.sleep(0.15)
+
+    service.fail = False
+    service.delay = 0.3
+    results = []
+
+    def caller():
+        results.append(layer.call("svc", service.fetch, fallback=lambda error: "fast-fail"))
+
+    threads = [threading.Thread(target=caller) for _ in range(5)]
+    requests = service.requests
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert service.requests - requests == 1
+    assert results.count({"ok": True}) == 1
+    assert results.count("fast-fail") == 4
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_hedge_wins_over_stalled_attempt(service):
+    layer = ResilienceLayer()
+    layer.register("svc", slow_call_threshold=0.5)
+    service.stall_next = 1.0
+
+    started = time.monotonic()
+    assert layer.call("svc", service.fetch, hedge_delay=0.1) == {"ok": True}
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 0.5
+    assert service.requests == 2
+    assert layer.breakers["svc"].state == CircuitBreaker.CLOSED
+
+def test_hedges_do_not_queue_under_concurrency(service):
+    layer = ResilienceLayer()
+    breaker = layer.register("svc", failure_threshold=1, slow_call_threshold=0.5)
+    service.delay = 0.2
+
+    threads = [threading.Thread(target=layer.call, args=("svc", service.fetch), kwargs={"hedge_delay": 1.0})
+               for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # 20 concurrent 200 ms calls must not look slow to the breaker
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_ignored_exceptions_do_not_trip(service):
+    class BadRequest(Exception):
+        pass
+
+    def rejected():
+        service.fetch()
+        raise BadRequest("unknown city")
+
+    layer = ResilienceLayer()
+    breaker = layer.register("svc", failure_threshold=1, ignore=(BadRequest,))
+
+    for _ in range(3):
+        # Ignored errors reach the caller even when a fallback is given
+        with pytest.raises(BadRequest):
+            layer.call("svc", rejected, fallback=lambda error: "fallback")
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.failures == 0
@@ -0,0 +1,22 @@
+from datetime import datetime
+
+from responses import ClockFormatter, ResponseTemplates
+
+AFTERNOON = datetime(2026, 10, 19, 13, 10)
+
+def test_clock_is_built_per_locale():
+    assert ClockFormatter("en").format(AFTERNOON)["time"] == "01:10 PM"
+    assert ClockFormatter("es").format(AFTERNOON)["time"] == "1:10 p. m."
+    assert ClockFormatter("es", "24").format(AFTERNOON)["long_date"] == "lunes 19 de octubre"
+
+def test_every_locale_renders_every_intent():
+    english = ResponseTemplates("en-US", seed=0)
+    spanish = ResponseTemplates("es-ES", "24", seed=0)
+    for templates in (english, spanish):
+        # Pin the clock instead of reading the current time
+        values = templates.clock.format(AFTERNOON)
+        templates.clock.current = lambda values=values: values
+
+    assert english.render("time_long") == "It's 01:10 PM on Monday, October 19"
+    assert spanish.render("time_long") == "Son las 13:10 del lunes 19 de octubre"
+    assert set(spanish.templates) == set(english.templates)
@@ -0,0 +1,59 @@
+import json
+
+from search_index import SearchIndex, load_corpus
+
+FAQ = [
+    ("VPN setup", "Install the VPN client, sign in with your work account and pick the nearest gateway."),
+    ("Password reset", "Reset your password from the account portal. Passwords expire every 90 days."),
+    ("Holiday calendar", "The office is closed on New Year's Day and the last week of December."),
+    ("Printer help", "Add the office printer from settings. The printer queue is cleared nightly."),
+]
+
+def test_ranks_the_matching_document_first():
+    index = SearchIndex(FAQ)
+    # "account" also appears in the VPN entry, which ranks below
+    results = index.search("reset my account password")
+    assert [title for _, title, _ in results] == ["Password reset", "VPN setup"]
+    assert results[0][0] > results[1][0]
+
+    assert index.search("office printer")[0][1] == "Printer help"
+    assert index.search("") == []
+    assert index.search("submarine") == []
+
+def test_add_clears_cached_results():
+    index = SearchIndex(FAQ)
+    assert index.search("expense report") == []
+    assert index.search_cached.cache_info().currsize == 1
+
+    index.add("Expense report", "Submit each expense report through the finance portal.")
+    assert index.search_cached.cache_info().currsize == 0
+    assert index.search("expense report")[0][1] == "Expense report"
+
+def test_weak_matches_fall_back():
+    index = SearchIndex(FAQ)
+    assert index.answer("vpn gateway setup").startswith("According to VPN setup:")
+
+    # One rare shared term scores well, but covers too little of the question
+    assert index.search("python new year resolution ideas")[0][1] == "Holiday calendar"
+    assert index.answer("python new year resolution ideas") is None
+
+    strict = SearchIndex(FAQ, min_score=100)
+    assert strict.answer("vpn gateway setup") is None
+
+def test_long_answers_are_cut_at_a_sentence_or_word():
+    sentences = SearchIndex([("Policy", "First sentence here. " + "word " * 100)])
+    assert sentences.answer("policy sentence") == "According to Policy: First sentence here."
+
+    words = SearchIndex([("Policy", "policy " + "word " * 100)])
+    answer = words.answer("policy word", max_length=40)
+    assert answer.endswith("word...")
+    assert len(answer) <= len("According to Policy: ") + 40 + 3
+
+def test_load_corpus_from_directory_and_jsonl(tmp_path):
+    (tmp_path / "vpn_setup.md").write_text("Install the client.")
+    (tmp_path / "notes.bin").write_text("ignored")
+    assert list(load_corpus(str(tmp_path))) == [("vpn setup", "Install the client.")]
+
+    corpus = tmp_path / "faq.jsonl"
+    corpus.write_text(json.dumps({"title": "A", "text": "alpha"}) + "\n\n")
+    assert list(load_corpus(str(corpus))) == [("A", "alpha")]